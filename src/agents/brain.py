@@ -1,40 +1,73 @@
+import asyncio
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Literal
+import time
+from functools import cached_property
+from typing import Literal, Optional
 from decimal import Decimal
-from redis.asyncio import Redis
-
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.graph import StateGraph, END
 
 from src.data.models import OrderSide, AssetType
 from src.agents.models import AgentBrainState
 from src.agents.models import AgentDecision
+from src.agents.models import AgentGroupDecision
+from src.agents.decision_cache import DecisionCache
 from src.infra.memory_store import MemoryStore
+from src.infra.redis_pool import get_redis
+from src.infra.agent_log import AgentLogStream, build_log_event
+from src.engine.news import NewsService
 
 logger = logging.getLogger(__name__)
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 
 class AgentBrain:
-    def __init__(self, model_name="gemini-2.5-flash"):
-        self.redis = Redis.from_url(REDIS_URL, decode_responses=True)
-        api_key = os.getenv("GOOGLE_API_KEY")
-        self.llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            api_key=api_key,
+    """
+    LLM, embeddings e grafo são criados no primeiro uso (cached_property):
+    langchain/langgraph/Google GenAI só são importados quando o agente pensa.
+    """
+
+    def __init__(self, model_name="gemini-2.5-flash", decision_cache: Optional[DecisionCache] = None):
+        self.redis = get_redis(REDIS_URL)
+        self.model_name = model_name
+        self.api_key = os.getenv("GOOGLE_API_KEY")
+        self.agent_log = AgentLogStream(self.redis)
+        self.decision_cache = decision_cache
+        self.news = NewsService(self.redis)
+        self.latest_news: Optional[dict] = None
+        self._news_task: Optional[asyncio.Task] = None
+
+    @cached_property
+    def llm(self):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(
+            model=self.model_name,
+            api_key=self.api_key,
             temperature=0.7
         )
-        self.memory_store = MemoryStore(
+
+    @cached_property
+    def structured_llm(self):
+        return self.llm.with_structured_output(AgentDecision, include_raw=True)
+
+    @cached_property
+    def structured_group_llm(self):
+        return self.llm.with_structured_output(AgentGroupDecision, include_raw=True)
+
+    @cached_property
+    def memory_store(self) -> MemoryStore:
+        return MemoryStore(
             redis_url=REDIS_URL,
-            api_key=api_key
+            api_key=self.api_key
         )
-        self.structured_llm = self.llm.with_structured_output(AgentDecision) 
-        self.graph = self._build_graph()
+
+    @cached_property
+    def graph(self):
+        return self._build_graph()
 
     def _build_graph(self):
+        from langgraph.graph import StateGraph, END
+
         workflow = StateGraph(AgentBrainState)
 
         workflow.add_node("perceive", self.perceive_market)
@@ -48,6 +81,39 @@ class AgentBrain:
 
         return workflow.compile()
 
+    async def start_news_listener(self):
+        """
+        Passa a receber notícias por push (Pub/Sub) em vez de ler o histórico a cada turno.
+        Retorna depois que a assinatura está ativa e `latest_news` foi semeado do histórico.
+        """
+        if self._news_task is None:
+            ready = asyncio.Event()
+            self._news_task = asyncio.create_task(self._listen_news(ready))
+            await ready.wait()
+
+    async def _seed_news(self):
+        """Lê o histórico sem sobrescrever uma notícia mais nova já recebida por push."""
+        latest = await self.news.latest()
+        if latest and latest.get("id", 0) > (self.latest_news or {}).get("id", 0):
+            self.latest_news = latest
+
+    async def _listen_news(self, ready: asyncio.Event):
+        async def on_subscribed():
+            # a cada (re)assinatura: cobre o que foi publicado antes ou durante a queda
+            await self._seed_news()
+            ready.set()
+
+        while True:
+            try:
+                async for event in self.news.subscribe(on_subscribed=on_subscribed):
+                    self.latest_news = event
+                    logger.info(f"Notícia #{event.get('id')} recebida: {event.get('content')}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Assinatura de notícias caiu, reconectando: {e}")
+                await asyncio.sleep(1)
+
     async def perceive_market(self, state: AgentBrainState):
         logger.info(f"{state['agent_id']} observando mercado...")
 
@@ -65,22 +131,44 @@ class AgentBrain:
         query_context = f"Market Trend: {market_obs.get('trend', 'flat')}. Last Price: {market_obs.get('last_price')}"
         memories = await self.memory_store.recall_memories(state['agent_id'], query_context)
         
-        last_news_list = await self.redis.lrange("market:news_history", 0, 0)
+        if self.latest_news is None:
+            self.latest_news = await self.news.latest()
+
         breaking_news = "Sem notícias recentes."
-        if last_news_list:
-            try:
-                breaking_news = json.loads(last_news_list[0]).get("content", "")
-            except:
-                breaking_news = str(last_news_list[0])
+        if self.latest_news:
+            breaking_news = self.latest_news.get("content", "")
 
         state['breaking_news'] = breaking_news
+        state['news_id'] = self.latest_news.get("id") if self.latest_news else None
         state["market_data"] = market_obs
         state["memories"] = memories
+        state["performance"] = await self._read_performance(state["agent_id"])
 
         return state
 
+    async def _read_performance(self, agent_id: str) -> Optional[dict]:
+        """PnL do agente (marcado aos preços atuais) e top 3 do leaderboard do engine."""
+        from src.engine.positions import mark_to_market
+
+        try:
+            own, marks, leaders = await asyncio.gather(
+                self.redis.hget("market:positions", agent_id),
+                self.redis.hgetall("market:marks"),
+                self.redis.get("market:leaderboard"),
+            )
+            marks = {asset: float(price) for asset, price in (marks or {}).items()}
+            return {
+                "pnl": mark_to_market(json.loads(own), marks)["pnl"] if own else 0.0,
+                "leaders": json.loads(leaders)[:3] if leaders else [],
+            }
+        except Exception as e:
+            logger.warning(f"Erro ao ler desempenho: {e}")
+            return None
+
     async def generate_strategy(self, state: AgentBrainState):
         """LLM central"""
+        from langchain_core.prompts import ChatPromptTemplate
+
         logger.info(f"{state['agent_id']} pensando...")
 
         prompt = ChatPromptTemplate.from_messages([
@@ -91,6 +179,7 @@ class AgentBrain:
             - Dolar: {dolar}
             - Inventário: {inventory}
             - Mercado: {market_data}
+            - Desempenho (PnL dos seus trades e líderes do mercado): {performance}
             ÚLTIMA NOTÍCIA: {breaking_news}
 
             Como isso afeta sua estratégia? Se a notícia for ruim para um ativo que você tem, considere vender (Panic Sell). 
@@ -103,13 +192,125 @@ class AgentBrain:
             """)
         ])
 
-        chain = prompt | self.structured_llm
-        decision: AgentDecision = await chain.ainvoke(state)
+        decision = self.decision_cache.get(state) if self.decision_cache else None
+        meta = {"source": "cache", "latency_ms": 0.0, "tokens_in": 0, "tokens_out": 0}
+
+        if decision is None:
+            chain = prompt | self.structured_llm
+            started = time.perf_counter()
+            decision, meta = self._unpack_llm_result(await chain.ainvoke(state), started, source="llm")
+            if self.decision_cache:
+                self.decision_cache.put(state, decision)
+
+        return self._decision_update(decision, meta)
+
+    async def generate_group_strategy(self, states: list[AgentBrainState]) -> list[Optional[dict]]:
+        """
+        Uma única chamada ao LLM decide por um grupo de agentes do mesmo papel.
+        O contexto de mercado e a notícia são compartilhados; agentes sem decisão
+        válida na resposta caem para a chamada individual (generate_strategy).
+        Se a chamada individual também falhar, o agente fica sem update (None).
+        """
+        updates: dict[str, Optional[dict]] = {}
+        pending: list[AgentBrainState] = []
+
+        for state in states:
+            cached = self.decision_cache.get(state) if self.decision_cache else None
+            if cached is not None:
+                updates[state["agent_id"]] = self._decision_update(
+                    cached, {"source": "cache", "latency_ms": 0.0, "tokens_in": 0, "tokens_out": 0}
+                )
+            else:
+                pending.append(state)
 
+        if len(pending) > 1:
+            from langchain_core.prompts import ChatPromptTemplate
+
+            logger.info(f"Grupo {pending[0]['role']} pensando ({len(pending)} agentes)...")
+
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", "Você decide por um grupo de agentes. Todos são {role}; cada um tem sua própria personalidade e carteira."),
+                ("human", """
+                MERCADO: {market_data}
+                ÚLTIMA NOTÍCIA: {breaking_news}
+
+                Se a notícia for ruim para um ativo que um agente tem, considere vender (Panic Sell).
+                 Se for boa, considere comprar (FOMO).
+
+                AGENTES:
+                {agents}
+
+                Retorne exatamente uma decisão por agente, usando o agent_id informado.
+                """)
+            ])
+
+            agents_block = "\n".join(
+                f"""- agent_id: {s['agent_id']}
+                  personalidade: {s['personality']}
+                  ouro: {s['gold']} | dolar: {s['dolar']} | inventário: {s['inventory']}
+                  desempenho: {s.get('performance')}
+                  memórias: {s.get('memories') or 'nenhuma'}"""
+                for s in pending
+            )
+
+            try:
+                chain = prompt | self.structured_group_llm
+                started = time.perf_counter()
+                result, meta = self._unpack_llm_result(await chain.ainvoke({
+                    "role": pending[0]["role"],
+                    "market_data": pending[0]["market_data"],
+                    "breaking_news": pending[0].get("breaking_news"),
+                    "agents": agents_block,
+                }), started, source="group", share=len(pending))
+                decisions = {item.agent_id: item for item in result.decisions}
+            except Exception as e:
+                logger.warning(f"Decisão em grupo falhou, usando chamadas individuais: {e}")
+                decisions = {}
+
+            for state in pending:
+                item = decisions.get(state["agent_id"])
+                if item is None:
+                    continue
+                decision = AgentDecision.model_validate(item.model_dump(exclude={"agent_id"}))
+                if self.decision_cache:
+                    self.decision_cache.put(state, decision)
+                updates[state["agent_id"]] = self._decision_update(decision, meta)
+
+        for state in states:
+            if state["agent_id"] not in updates:
+                try:
+                    updates[state["agent_id"]] = await self.generate_strategy(state)
+                except Exception as e:
+                    logger.warning(f"{state['agent_id']} sem decisão neste ciclo: {e}")
+                    updates[state["agent_id"]] = None
+
+        return [updates[state["agent_id"]] for state in states]
+
+    @staticmethod
+    def _unpack_llm_result(result: dict, started: float, source: str, share: int = 1):
+        """
+        Separa a saída estruturada (include_raw=True) da telemetria da chamada.
+        Em chamadas de grupo, latência e tokens são divididos entre os `share` agentes.
+        """
+        if result.get("parsed") is None:
+            raise ValueError(f"Resposta fora do schema: {result.get('parsing_error')}")
+
+        usage = getattr(result.get("raw"), "usage_metadata", None) or {}
+        meta = {
+            "source": source,
+            "latency_ms": round((time.perf_counter() - started) * 1000 / share, 1),
+            "tokens_in": usage.get("input_tokens", 0) // share,
+            "tokens_out": usage.get("output_tokens", 0) // share,
+        }
+        return result["parsed"], meta
+
+    @staticmethod
+    def _decision_update(decision: AgentDecision, meta: dict) -> dict:
         return {
             "thought_process": decision.thought_process,
             "chosen_action": decision.action,
-            "order_details": decision.order_details.model_dump() if decision.order_details else None
+            "order_details": decision.order_details.model_dump() if decision.order_details else None,
+            "decision_meta": meta,
         }
 
     async def execute_order(self, state: AgentBrainState):
@@ -123,6 +324,7 @@ class AgentBrain:
                 total_cost = Decimal(str(details["price"])) * details["quantity"]
                 if state["gold"] < float(total_cost):
                     logger.warning(f"{state['agent_id']} Saldo Insuficiente! Tem ${state['gold']}, precisa ${total_cost}")
+                    await self.agent_log.append(build_log_event(state, "REJECTED"))
                     return state
 
             elif details["side"] == "ASK":
@@ -130,6 +332,7 @@ class AgentBrain:
                 current_qty = state["inventory"].get(asset, 0) # type: ignore
                 if current_qty < details["quantity"]:
                     logger.warning(f"{state['agent_id']} Estoque Insuficiente de {asset}! Tem {current_qty}, quer vender {details['quantity']}")
+                    await self.agent_log.append(build_log_event(state, "REJECTED"))
                     return state
 
             order_payload = {
@@ -140,25 +343,38 @@ class AgentBrain:
                 "price": details["price"],
                 "quantity": details["quantity"],
             }
-            await self.redis.publish("market:orders", json.dumps(order_payload))
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.publish("market:orders", json.dumps(order_payload))
+                self.agent_log.add(pipe, build_log_event(state, action))
+                await pipe.execute()
             logger.info(f"{state['agent_id']} ENVIOU ORDEM: {details['side']} {details['quantity']} {details['asset']} @ {details['price']}")
 
-            log_entry = {
-                "timestamp": datetime.now().strftime("%H:%M:%S"),
-                "agent_id": state["agent_id"],
-                "action": f"{action} {details['side']} {details['asset']}",
-                "reasoning": state.get("thought_process", "")
-            }
-            await self.redis.lpush("agent:logs", json.dumps(log_entry))
-            await self.redis.ltrim("agent:logs", 0, 99)
-
             memory_content = f"Cenário: {state['market_data']}. Ação: {action} {details['side']} {details['asset']}. Motivo: {state['thought_process']}"
             await self.memory_store.save_memory(state['agent_id'], memory_content)
             
         else:
             logger.info(f"{state['agent_id']} decidiu esperar.")
+            await self.agent_log.append(build_log_event(state, "WAIT"))
             
         return state
 
     async def run_cycle(self, initial_state: AgentBrainState):
         return await self.graph.ainvoke(initial_state)
+
+    async def run_group_cycle(self, states: list[AgentBrainState]) -> list[AgentBrainState]:
+        """Perceive-Reason-Act para um grupo, com um único passo de raciocínio compartilhado."""
+        perceived = await asyncio.gather(*(self.perceive_market(state) for state in states))
+        updates = await self.generate_group_strategy(list(perceived))
+
+        for state, update in zip(perceived, updates):
+            # sem decisão: mantém o estado e não reenvia a ordem do ciclo anterior
+            if update is None:
+                continue
+            state.update(update)
+            try:
+                await self.execute_order(state)
+            except Exception as e:
+                # a decisão dos outros agentes já foi paga: segue para o próximo
+                logger.error(f"Erro ao executar a ordem de {state['agent_id']}: {e}")
+
+        return list(perceived)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from src.agents.models import AgentBrainState, AgentDecision
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    decision: AgentDecision
+    expires_at: float
+
+
+class DecisionCache:
+    """
+    Reuses LLM decisions across agents that are in an equivalent situation.
+
+    The situation fingerprint is built from role, personality, bucketed market
+    prices, the current news id and bucketed holdings. Buckets are logarithmic, so
+    `price_bucket=0.02` groups prices within ~2% of each other.
+    Cached decisions are returned with a small jitter on price and quantity,
+    otherwise every agent of the same archetype would quote the exact same order.
+    `clock` measures the TTL (seconds); headless runs pass the simulated clock.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        price_bucket: float = 0.02,
+        holdings_bucket: float = 0.25,
+        jitter: float = 0.02,
+        max_entries: int = 1024,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.price_bucket = price_bucket
+        self.holdings_bucket = holdings_bucket
+        self.jitter = jitter
+        self.max_entries = max_entries
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _bucket(value: float, step: float) -> int:
+        """Log bucket of a non-negative value. Zero (or less) has its own bucket."""
+        if not value or value <= 0:
+            return -1
+        return round(math.log(value) / math.log1p(step))
+
+    def fingerprint(self, state: AgentBrainState) -> str:
+        market = state.get("market_data") or {}
+        inventory = state.get("inventory") or {}
+
+        key = {
+            "role": state.get("role"),
+            "personality": state.get("personality"),
+            "market": {
+                name: self._bucket(float(market.get(name) or 0), self.price_bucket)
+                for name in ("best_bid", "best_ask", "last_price")
+            },
+            "trend": market.get("trend", "flat"),
+            "news": state.get("news_id") or state.get("breaking_news") or "",
+            "gold": self._bucket(float(state.get("gold") or 0), self.holdings_bucket),
+            "dolar": self._bucket(float(state.get("dolar") or 0), self.holdings_bucket),
+            "inventory": sorted(
+                (getattr(asset, "value", str(asset)), self._bucket(qty, self.holdings_bucket))
+                for asset, qty in inventory.items()
+            ),
+        }
+        raw = json.dumps(key, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, state: AgentBrainState) -> Optional[AgentDecision]:
+        key = self.fingerprint(state)
+        entry = self.entries.get(key)
+
+        if entry is None or entry.expires_at < self.clock():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        logger.debug(f"Decisão em cache reutilizada para {state['agent_id']}")
+        return self._perturb(entry.decision)
+
+    def put(self, state: AgentBrainState, decision: AgentDecision):
+        key = self.fingerprint(state)
+        self.entries[key] = CacheEntry(decision=decision, expires_at=self.clock() + self.ttl)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _perturb(self, decision: AgentDecision) -> AgentDecision:
+        """
+        Returns a copy of the decision with price/quantity shifted by up to `jitter`.
+        Quantities move by at least one unit, otherwise small orders (< 1/jitter)
+        would always round back to the cached quantity.
+        """
+        if not self.jitter or decision.order_details is None:
+            return decision.model_copy(deep=True)
+
+        details = decision.order_details
+        price = details.price * (1 + self.rng.uniform(-self.jitter, self.jitter))
+        step = max(round(details.quantity * self.jitter), 1)
+        quantity = details.quantity + self.rng.randint(-step, step)
+
+        return decision.model_copy(update={
+            "order_details": details.model_copy(update={
+                "price": max(round(price, 2), 0.01),
+                "quantity": max(quantity, 1),
+            })
+        })
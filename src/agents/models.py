@@ -22,14 +22,17 @@ class AgentBrainState(TypedDict):
     # perception
     market_data: MarketObservation
     memories: Optional[str]
+    performance: Optional[dict] # pnl próprio e líderes (PositionBook)
     
     # reasoness
     thought_process: Optional[str]
     breaking_news: Optional[str]
+    news_id: Optional[int]
     
     # decision
     chosen_action: Optional[str]
     order_details: Optional[dict]
+    decision_meta: Optional[dict] # source, latency_ms, tokens_in, tokens_out
 
 class OrderDetails(BaseModel):
     asset: AssetType
@@ -41,4 +44,10 @@ class OrderDetails(BaseModel):
 class AgentDecision(BaseModel):
     thought_process: str = Field(description="Raciocínio estratégico curto sobre a decisão.")
     action: Literal["PLACE_ORDER", "WAIT"] = Field(description="Ação a ser tomada.")
-    order_details: Optional[OrderDetails] = Field(description="Detalhes da ordem se a ação for PLACE_ORDER.")
\ No newline at end of file
+    order_details: Optional[OrderDetails] = Field(description="Detalhes da ordem se a ação for PLACE_ORDER.")
+
+class AgentGroupDecisionItem(AgentDecision):
+    agent_id: str = Field(description="ID do agente ao qual esta decisão se refere.")
+
+class AgentGroupDecision(BaseModel):
+    decisions: List[AgentGroupDecisionItem] = Field(description="Uma decisão para cada agente do grupo.")
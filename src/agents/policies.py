@@ -0,0 +1,119 @@
+import random
+from typing import Optional
+
+from src.data.models import AssetType, OrderSide, OrderType
+from src.agents.models import AgentBrainState, OrderDetails
+
+BULLISH_WORDS = (
+    "seca", "guerra", "explodir", "dobrar", "escassez", "praga", "embargo", "incêndios",
+    "greve", "fungo", "proíbe", "boom", "calor", "pânico", "aquecem", "choque de oferta",
+)
+BEARISH_WORDS = (
+    "abundante", "despencam", "caem", "super safra", "zerada", "triplicar",
+    "falência", "recall", "contaminação", "estáveis",
+)
+
+def news_bias(event: Optional[dict]) -> dict[str, int]:
+    """+1 (alta), -1 (baixa) ou 0 para cada ativo citado na notícia, por palavras-chave."""
+    if not event:
+        return {}
+    content = event.get("content", "").lower()
+    bullish = any(word in content for word in BULLISH_WORDS)
+    bearish = any(word in content for word in BEARISH_WORDS)
+    bias = (1 if bullish else 0) - (1 if bearish else 0)
+    return {asset: bias for asset in event.get("assets", [])}
+
+class HeuristicPolicy:
+    """
+    Política de decisão offline (sem LLM) com a mesma interface de
+    `AgentBrain.run_cycle`, para simulações headless e sweeps.
+
+    Lê `market_data["book"]` (cotação por ativo) e `market_data["news"]`
+    preenchidos pelo simulador e decide pelo papel do agente.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        tick_size: float = 0.01,
+        spread: float = 0.01,
+        wait_probability: float = 0.2,
+        max_quantity: int = 10,
+    ):
+        self.rng = random.Random(seed)
+        self.tick_size = tick_size
+        self.spread = spread
+        self.wait_probability = wait_probability
+        self.max_quantity = max_quantity
+
+    async def run_cycle(self, state: AgentBrainState) -> AgentBrainState:
+        state.update(self.decide(state))
+        return state
+
+    def decide(self, state: AgentBrainState) -> dict:
+        market = state["market_data"]
+        assets = [a for a, qty in state["inventory"].items() if a not in (AssetType.GOLD, AssetType.DOLAR)]
+        if not assets or self.rng.random() < self.wait_probability:
+            return self._update("Sem oportunidade clara.", None)
+
+        asset = self.rng.choice(assets)
+        key = getattr(asset, "value", asset)
+        quote = market.get("book", {}).get(key, {})
+        reference = quote.get("last_price") or market.get("reference_price") or 10.0
+        bias = news_bias(market.get("news")).get(key, 0)
+        trend = {"up": 1, "down": -1}.get(quote.get("trend"), 0)
+        role = state["role"].lower()
+
+        if "market maker" in role:
+            side = self.rng.choice([OrderSide.BID, OrderSide.ASK])
+            edge = -self.spread if side == OrderSide.BID else self.spread
+            reason = "Fornecendo liquidez ao redor do último preço."
+        elif "producer" in role:
+            side, edge = OrderSide.ASK, -self.spread / 2
+            reason = "Vendendo produção para pagar contas."
+        elif "value" in role or "investor" in role:
+            if bias > 0 or trend > 0:
+                return self._update("Preço esticado, esperando.", None)
+            side, edge = OrderSide.BID, -3 * self.spread
+            reason = "Comprando abaixo do preço de referência."
+        else:
+            signal = bias or trend or self.rng.choice([-1, 1])
+            side = OrderSide.BID if signal > 0 else OrderSide.ASK
+            edge = self.spread if side == OrderSide.BID else -self.spread
+            reason = f"Seguindo o momentum ({'alta' if signal > 0 else 'baixa'})."
+
+        price = reference * (1 + edge + self.rng.uniform(-self.spread, self.spread) / 2)
+        price = max(round(round(price / self.tick_size) * self.tick_size, 10), self.tick_size)
+
+        details = OrderDetails(
+            asset=asset,
+            side=side,
+            type=OrderType.LIMIT,
+            price=price,
+            quantity=self.rng.randint(1, self.max_quantity),
+        )
+        return self._update(reason, details)
+
+    @staticmethod
+    def _update(thought: str, details: Optional[OrderDetails]) -> dict:
+        return {
+            "thought_process": thought,
+            "chosen_action": "PLACE_ORDER" if details else "WAIT",
+            "order_details": details.model_dump() if details else None,
+            "decision_meta": {"source": "policy", "latency_ms": 0.0, "tokens_in": 0, "tokens_out": 0},
+        }
+
+class BrainPolicy:
+    """Usa o passo de raciocínio de um AgentBrain (LLM) sem o perceive/act via Redis."""
+
+    def __init__(self, brain):
+        self.brain = brain
+
+    def bind_clock(self, clock):
+        """Chamado pelo simulador headless: o TTL do cache passa a correr no tempo simulado."""
+        if self.brain.decision_cache:
+            self.brain.decision_cache.clock = clock.monotonic
+
+    async def run_cycle(self, state: AgentBrainState) -> AgentBrainState:
+        state.update(await self.brain.generate_strategy(state))
+        return state
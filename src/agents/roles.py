@@ -0,0 +1,45 @@
+from typing import Optional
+from src.data.models import AssetType
+from src.agents.models import AgentBrainState
+
+# (role, personality, gold, dolar)
+ROLES_CONFIG = [
+    ("Market Maker Conversador", "Conservador. Fornece liquidez.", 100000.0, 50000.0),
+    ("Market Maker Speculator", "Agressivo. Fornece liquidez.", 100000.0, 50000.0),
+    ("Speculator", "Agressivo (FOMO).", 5000.0, 10000.0),
+    ("Speculator", "Agressivo (Arbitrário). Gosta de trades curtos. Spreads curtos e ativos baratos para ganhos rápidos.", 5000.0, 10000.0),
+    ("Producer", "Pragmático. Vende para pagar contas.", 1000.0, 60000.0),
+    ("Value Investor", "Analítico. Compra na baixa.", 10000.0, 500000.0),
+    ("Regular_Investor", "Conservador. Gosta de investimentos seguros.", 5000.0, 1000000.0),
+]
+
+def build_agent_states(
+    n_agents: int = 20,
+    roles_config: Optional[list[tuple]] = None,
+    inventory: Optional[dict[AssetType, int]] = None,
+) -> list[AgentBrainState]:
+    """Estados iniciais dos agentes, distribuindo os papéis em rodízio."""
+    roles_config = roles_config or ROLES_CONFIG
+    inventory = inventory or {AssetType.WOOD: 50, AssetType.FOOD: 50}
+
+    agents = []
+    for i in range(1, n_agents + 1):
+        role, persona, gold, dolar = roles_config[i % len(roles_config)]
+        agents.append({
+            "agent_id": f"agent_{i:02d}_{role.replace(' ', '_').lower()}",
+            "role": role,
+            "personality": persona,
+            "gold": gold,
+            "dolar": dolar,
+            "inventory": dict(inventory),
+            "market_data": {"best_bid": 0, "best_ask": 0, "last_price": 0, "trend": "flat"},
+            "memories": "",
+            "performance": None,
+            "breaking_news": None,
+            "news_id": None,
+            "thought_process": None,
+            "chosen_action": None,
+            "order_details": None,
+            "decision_meta": None
+        })
+    return agents
@@ -0,0 +1,51 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any
+
+class EventBus:
+    """
+    Pub/Sub em processo, com os mesmos nomes de canal do Redis
+    (`market:orders`, `market:ticker`, `market:news`). As mensagens são os
+    próprios objetos (Order, Trade, dict), sem serialização.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, list[asyncio.Queue]] = defaultdict(list)
+
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[channel].append(queue)
+        return queue
+
+    async def publish(self, channel: str, message: Any) -> int:
+        queues = self._subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait(message)
+        return len(queues)
+
+    async def join(self):
+        """Espera até todas as mensagens (e as que elas geraram) serem processadas."""
+        queues = [q for qs in self._subscribers.values() for q in qs]
+        while True:
+            for queue in queues:
+                await queue.join()
+            if all(queue.empty() for queue in queues):
+                return
+
+class SimClock:
+    """Relógio simulado: o tempo só anda com `advance`, nunca com sleeps reais."""
+
+    def __init__(self, start: datetime = datetime(2025, 1, 1)):
+        self.start = start
+        self.elapsed = 0.0
+
+    def advance(self, seconds: float):
+        self.elapsed += seconds
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=self.elapsed)
+
+    def monotonic(self) -> float:
+        """Segundos simulados, no lugar de time.monotonic (ex: TTL do DecisionCache)."""
+        return self.elapsed
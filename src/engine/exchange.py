@@ -1,6 +1,7 @@
 import heapq
+import itertools
 from datetime import datetime
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 from dataclasses import dataclass, field
 from decimal import Decimal
 
@@ -10,10 +11,12 @@ from src.data.models import Order, Trade, OrderSide, AssetType, OrderType
 class AskEntry:
     """
     Wrapper for Sell Orders (Asks) in the Min-Heap.
-    Sorting: Lowest Price first, then Earliest Timestamp.
+    Sorting: Lowest Price first, then Earliest Timestamp, then arrival order
+    (`seq`), so ties in price and timestamp still fill FIFO.
     """
     price: Decimal
     timestamp: datetime
+    seq: int
     order: Order = field(compare=False)
     remaining_qty: int = field(compare=False)
 
@@ -21,18 +24,39 @@ class AskEntry:
 class BidEntry:
     """
     Wrapper for Buy Orders (Bids) in the Max-Heap.
-    Sorting: Highest Price first (via neg_price), then Earliest Timestamp.
+    Sorting: Highest Price first (via neg_price), then Earliest Timestamp, then
+    arrival order (`seq`).
     """
     neg_price: Decimal
     timestamp: datetime
+    seq: int
     order: Order = field(compare=False)
     remaining_qty: int = field(compare=False)
 
+RestListener = Callable[[Order, int], None]
+
 class OrderBook:
-    def __init__(self, asset: AssetType):
+    def __init__(
+        self,
+        asset: AssetType,
+        clock: Callable[[], datetime] = datetime.now,
+        on_rest_change: Optional[RestListener] = None,
+    ):
+        """
+        `on_rest_change(order, remaining_qty)` is called whenever a resting order
+        enters the book, is partially filled, or leaves it (remaining_qty == 0,
+        including self-trade prevention drops).
+        """
         self.asset = asset
+        self.clock = clock
+        self.on_rest_change = on_rest_change
         self.bids: List[BidEntry] = []
         self.asks: List[AskEntry] = []
+        self._seq = itertools.count()
+
+    def _notify(self, order: Order, remaining_qty: int):
+        if self.on_rest_change:
+            self.on_rest_change(order, remaining_qty)
 
     def process_order(self, order: Order) -> List[Trade]:
         """
@@ -55,6 +79,7 @@ class OrderBook:
 
                 if best_ask.order.agent_id == order.agent_id:
                     heapq.heappop(self.asks)
+                    self._notify(best_ask.order, 0)
                     continue
 
                 if match_price >= best_ask.price:
@@ -67,12 +92,13 @@ class OrderBook:
                         asset=self.asset,
                         price=exec_price,
                         quantity=exec_qty,
-                        timestamp=datetime.now()
+                        timestamp=self.clock()
                     )
                     trades.append(trade)
 
                     remaining_qty -= exec_qty
                     best_ask.remaining_qty -= exec_qty
+                    self._notify(best_ask.order, best_ask.remaining_qty)
 
                     if best_ask.remaining_qty == 0:
                         heapq.heappop(self.asks)
@@ -83,10 +109,12 @@ class OrderBook:
                 entry = BidEntry(
                     neg_price=-order.price,
                     timestamp=order.timestamp,
+                    seq=next(self._seq),
                     order=order,
                     remaining_qty=remaining_qty
                 )
                 heapq.heappush(self.bids, entry)
+                self._notify(order, remaining_qty)
 
         else:
             while remaining_qty > 0 and self.bids:
@@ -96,6 +124,7 @@ class OrderBook:
                 # Self-Trading Prevention
                 if best_bid.order.agent_id == order.agent_id:
                     heapq.heappop(self.bids)
+                    self._notify(best_bid.order, 0)
                     continue
 
                 if match_price <= best_bid_price:
@@ -108,12 +137,13 @@ class OrderBook:
                         asset=self.asset,
                         price=exec_price,
                         quantity=exec_qty,
-                        timestamp=datetime.now()
+                        timestamp=self.clock()
                     )
                     trades.append(trade)
 
                     remaining_qty -= exec_qty
                     best_bid.remaining_qty -= exec_qty
+                    self._notify(best_bid.order, best_bid.remaining_qty)
 
                     if best_bid.remaining_qty == 0:
                         heapq.heappop(self.bids)
@@ -124,17 +154,19 @@ class OrderBook:
                 entry = AskEntry(
                     price=order.price,
                     timestamp=order.timestamp,
+                    seq=next(self._seq),
                     order=order,
                     remaining_qty=remaining_qty
                 )
                 heapq.heappush(self.asks, entry)
+                self._notify(order, remaining_qty)
 
         return trades
 
 class Exchange:
-    def __init__(self):
+    def __init__(self, clock: Callable[[], datetime] = datetime.now, on_rest_change: Optional[RestListener] = None):
         self.books: Dict[AssetType, OrderBook] = {
-            asset: OrderBook(asset) for asset in AssetType
+            asset: OrderBook(asset, clock, on_rest_change) for asset in AssetType
         }
 
     def process_order(self, order: Order) -> List[Trade]:
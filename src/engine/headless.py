@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from collections import defaultdict
+from decimal import Decimal
+from typing import Optional
+
+from src.data.models import AssetType, Order, OrderSide, Trade
+from src.engine.bus import EventBus, SimClock
+from src.engine.exchange import Exchange
+from src.engine.positions import PositionBook
+from src.infra.trade_store import TradeStore
+
+logger = logging.getLogger(__name__)
+
+class Reservations:
+    """
+    Saldo e estoque comprometidos por ordens em repouso no book, por agente.
+    Alimentado pelo `on_rest_change` do OrderBook (O(1) por evento), inclusive
+    quando a ordem sai do book por fill ou por self-trade prevention.
+    """
+
+    def __init__(self):
+        self.resting: dict[str, int] = {}
+        self.gold: dict[str, float] = defaultdict(float)
+        self.inventory: dict[tuple[str, AssetType], int] = defaultdict(int)
+
+    def on_rest_change(self, order: Order, remaining_qty: int):
+        delta = remaining_qty - self.resting.pop(order.id, 0)
+        if remaining_qty:
+            self.resting[order.id] = remaining_qty
+
+        if order.side == OrderSide.BID:
+            self.gold[order.agent_id] += float(order.price) * delta
+        else:
+            self.inventory[(order.agent_id, order.asset)] += delta
+
+    def gold_reserved(self, agent_id: str) -> float:
+        return self.gold.get(agent_id, 0.0)
+
+    def inventory_reserved(self, agent_id: str, asset: AssetType) -> int:
+        return self.inventory.get((agent_id, asset), 0)
+
+class HeadlessMarket:
+    """
+    Equivalente em processo do MarketService: consome `market:orders` do
+    EventBus, casa no Exchange e publica os trades em `market:ticker`.
+    """
+
+    def __init__(self, bus: EventBus, clock: SimClock, trade_store: Optional[TradeStore] = None):
+        self.bus = bus
+        self.clock = clock
+        self.reservations = Reservations()
+        self.exchange = Exchange(clock=clock.now, on_rest_change=self.reservations.on_rest_change)
+        self.positions = PositionBook()
+        self.trade_store = trade_store
+        self.last_price: dict[AssetType, Decimal] = {}
+        self.trades: list[Trade] = []
+        self.orders = bus.subscribe("market:orders")
+
+    async def run(self):
+        while True:
+            order = await self.orders.get()
+            try:
+                await self.process_order(order)
+            except Exception as e:
+                logger.error(f"Erro ao processar ordem {order}: {e}")
+            finally:
+                self.orders.task_done()
+
+    async def process_order(self, order: Order):
+        trades = self.exchange.process_order(order)
+
+        for trade in trades:
+            self.trades.append(trade)
+            self.positions.on_trade(trade)
+            self.last_price[trade.asset] = trade.price
+            if self.trade_store:
+                self.trade_store.append(trade)
+            await self.bus.publish("market:ticker", trade)
+
+    def quote(self, asset: AssetType) -> dict:
+        """Melhor bid/ask e último preço de um ativo (0 quando não há)."""
+        book = self.exchange.books[asset]
+        return {
+            "best_bid": float(-book.bids[0].neg_price) if book.bids else 0.0,
+            "best_ask": float(book.asks[0].price) if book.asks else 0.0,
+            "last_price": float(self.last_price.get(asset, 0)),
+        }
+
+    def start(self) -> asyncio.Task:
+        return asyncio.create_task(self.run())
@@ -1,8 +1,22 @@
 import asyncio
 import json
+import logging
+import os
 import random
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional
 from redis.asyncio import Redis
 
+from src.data.models import AssetType
+
+logger = logging.getLogger(__name__)
+
+NEWS_CHANNEL = "market:news"
+NEWS_HISTORY_KEY = "market:news_history"
+NEWS_SEQ_KEY = "market:news:seq"
+NEWS_HISTORY_MAX = int(os.getenv("NEWS_HISTORY_MAX", "100"))
+NEWS_INTERVAL = float(os.getenv("NEWS_INTERVAL", "60"))
+
 NEWS_SCENARIOS = [
     "Uma seca severa atingiu as plantações. A produção de FOOD vai cair pela metade.",
     "Foi descoberta uma nova técnica de corte de madeira. WOOD ficará abundante.",
@@ -11,19 +25,91 @@ NEWS_SCENARIOS = [
     "Tudo calmo no mercado. Previsão de tempo bom e colheitas estáveis.",
 ]
 
+def tag_assets(content: str) -> list[str]:
+    """Ativos citados na notícia (ex: 'FOOD', 'WOOD')."""
+    return [asset.value for asset in AssetType if asset.value in content]
+
+def build_news_event(event_id: int, content: str, timestamp: Optional[datetime] = None) -> dict:
+    return {
+        "id": event_id,
+        "type": "NEWS",
+        "content": content,
+        "assets": tag_assets(content),
+        "timestamp": (timestamp or datetime.now()).isoformat(),
+    }
+
+class NewsService:
+    """
+    Publica notícias com ids crescentes (INCR em `market:news:seq`) e mantém
+    um histórico limitado em `market:news_history` (LPUSH + LTRIM).
+    Consumidores recebem as notícias via `subscribe` (Pub/Sub), sem polling.
+    """
+
+    def __init__(self, redis: Redis, history_max: int = NEWS_HISTORY_MAX):
+        self.redis = redis
+        self.history_max = history_max
+
+    async def publish(self, content: str) -> dict:
+        event_id = await self.redis.incr(NEWS_SEQ_KEY)
+        event = build_news_event(event_id, content)
+        payload = json.dumps(event)
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.publish(NEWS_CHANNEL, payload)
+            pipe.lpush(NEWS_HISTORY_KEY, payload)
+            pipe.ltrim(NEWS_HISTORY_KEY, 0, self.history_max - 1)
+            await pipe.execute()
+
+        return event
+
+    async def latest(self) -> Optional[dict]:
+        """Última notícia do histórico (usada para o estado inicial dos consumidores)."""
+        raw = await self.redis.lindex(NEWS_HISTORY_KEY, 0)
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError):
+            return {"id": 0, "type": "NEWS", "content": str(raw), "assets": [], "timestamp": None}
+
+    async def subscribe(
+        self,
+        assets: Optional[Iterable[str]] = None,
+        on_subscribed: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Gera as notícias publicadas, opcionalmente filtradas pelos ativos citados.
+        `on_subscribed` roda com a assinatura já ativa e antes da primeira leitura:
+        é o ponto para ler o histórico sem perder o que for publicado nesse meio tempo.
+        """
+        wanted = {getattr(a, "value", a) for a in assets} if assets else None
+
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(NEWS_CHANNEL)
+        try:
+            if on_subscribed:
+                await on_subscribed()
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    event = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    logger.warning(f"Notícia inválida ignorada: {message['data']}")
+                    continue
+                if wanted and not wanted.intersection(event.get("assets", [])):
+                    continue
+                yield event
+        finally:
+            await pubsub.unsubscribe(NEWS_CHANNEL)
+            await pubsub.aclose()
+
+    async def run(self, interval: float = NEWS_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+
+            event = await self.publish(random.choice(NEWS_SCENARIOS))
+            print(f"BREAKING NEWS #{event['id']}: {event['content']}")
+
 async def broadcast_news(redis: Redis):
-    while True:
-        await asyncio.sleep(60) 
-        
-        news_content = random.choice(NEWS_SCENARIOS)
-        
-        event = {
-            "type": "NEWS",
-            "content": news_content,
-            "timestamp": "..."
-        }
-
-        await redis.publish("market:news", json.dumps(event))
-        await redis.lpush("market:news_history", json.dumps(event))
-        
-        print(f"BREAKING NEWS: {news_content}")
+    await NewsService(redis).run()
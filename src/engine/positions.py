@@ -0,0 +1,130 @@
+import numpy as np
+
+from src.data.models import AssetType, Trade
+
+ASSETS = list(AssetType)
+ASSET_INDEX = {asset: i for i, asset in enumerate(ASSETS)}
+
+class PositionBook:
+    """
+    Posições, caixa, custo médio e PnL de todos os agentes, em arrays NumPy
+    indexados por (agente, ativo).
+
+    Cada trade atualiza só as duas linhas envolvidas (O(1)); o PnL marcado a
+    mercado e o leaderboard são calculados de forma vetorizada sob demanda.
+    Caixa e posições partem de zero: o PnL mede só o resultado dos trades.
+
+    Os snapshots publicados não carregam PnL: dependem só dos trades do próprio
+    agente e são marcados a mercado pelo leitor (`mark_to_market`) com os
+    preços de `mark_prices()`, que mudam a cada trade de qualquer agente.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.agent_index: dict[str, int] = {}
+        self.agent_ids: list[str] = []
+        self.position = np.zeros((capacity, len(ASSETS)))
+        self.avg_cost = np.zeros((capacity, len(ASSETS)))
+        self.cash = np.zeros(capacity)
+        self.realized = np.zeros(capacity)
+        self.marks = np.zeros(len(ASSETS))
+
+    def _index(self, agent_id: str) -> int:
+        idx = self.agent_index.get(agent_id)
+        if idx is not None:
+            return idx
+
+        idx = len(self.agent_ids)
+        if idx == len(self.cash):
+            self._grow()
+        self.agent_index[agent_id] = idx
+        self.agent_ids.append(agent_id)
+        return idx
+
+    def _grow(self):
+        capacity = len(self.cash) * 2
+        self.position = np.resize(self.position, (capacity, len(ASSETS)))
+        self.avg_cost = np.resize(self.avg_cost, (capacity, len(ASSETS)))
+        self.cash = np.resize(self.cash, capacity)
+        self.realized = np.resize(self.realized, capacity)
+        # np.resize repete os dados; zera as linhas novas
+        half = capacity // 2
+        self.position[half:] = 0
+        self.avg_cost[half:] = 0
+        self.cash[half:] = 0
+        self.realized[half:] = 0
+
+    def on_trade(self, trade: Trade):
+        asset = ASSET_INDEX[trade.asset]
+        price = float(trade.price)
+
+        self._fill(self._index(trade.buyer_agent_id), asset, trade.quantity, price)
+        self._fill(self._index(trade.seller_agent_id), asset, -trade.quantity, price)
+        self.marks[asset] = price
+
+    def _fill(self, i: int, a: int, qty: int, price: float):
+        """Aplica uma execução com custo médio (qty > 0 compra, qty < 0 venda)."""
+        pos = self.position[i, a]
+        self.cash[i] -= qty * price
+
+        if pos == 0 or (pos > 0) == (qty > 0):
+            self.avg_cost[i, a] = (self.avg_cost[i, a] * abs(pos) + price * abs(qty)) / (abs(pos) + abs(qty))
+        else:
+            closed = min(abs(qty), abs(pos))
+            self.realized[i] += closed * (price - self.avg_cost[i, a]) * np.sign(pos)
+            if abs(qty) > abs(pos):
+                self.avg_cost[i, a] = price
+            elif abs(qty) == abs(pos):
+                self.avg_cost[i, a] = 0.0
+
+        self.position[i, a] = pos + qty
+
+    def unrealized(self) -> np.ndarray:
+        n = len(self.agent_ids)
+        return ((self.marks - self.avg_cost[:n]) * self.position[:n]).sum(axis=1)
+
+    def pnl(self) -> np.ndarray:
+        return self.realized[:len(self.agent_ids)] + self.unrealized()
+
+    def mark_prices(self) -> dict[str, float]:
+        """Último preço de cada ativo já negociado."""
+        return {ASSETS[a].value: float(self.marks[a]) for a in np.flatnonzero(self.marks)}
+
+    def snapshot(self, agent_id: str) -> dict:
+        """Posições, custo médio, caixa e PnL realizado (só muda com trades do agente)."""
+        i = self.agent_index.get(agent_id)
+        if i is None:
+            return {"agent_id": agent_id, "realized": 0.0, "cash": 0.0, "positions": {}}
+
+        return {
+            "agent_id": agent_id,
+            "realized": round(float(self.realized[i]), 2),
+            "cash": round(float(self.cash[i]), 2),
+            "positions": {
+                ASSETS[a].value: {"quantity": int(self.position[i, a]), "avg_cost": round(float(self.avg_cost[i, a]), 4)}
+                for a in np.flatnonzero(self.position[i])
+            },
+        }
+
+    def leaderboard(self, top: int = 10) -> list[dict]:
+        """Top `top` por PnL. O(N) por chamada: o engine publica de forma periódica, não por trade."""
+        pnl = self.pnl()
+        order = np.arange(len(pnl))
+        if top < len(pnl):
+            order = np.argpartition(-pnl, top - 1)[:top]
+        order = order[np.argsort(-pnl[order], kind="stable")]
+        return [
+            {"rank": rank, "agent_id": self.agent_ids[i], "pnl": round(float(pnl[i]), 2)}
+            for rank, i in enumerate(order, start=1)
+        ]
+
+def mark_to_market(snapshot: dict, marks: dict[str, float]) -> dict:
+    """PnL de um snapshot publicado, marcado aos preços atuais (`marks`)."""
+    unrealized = sum(
+        (marks.get(asset, pos["avg_cost"]) - pos["avg_cost"]) * pos["quantity"]
+        for asset, pos in snapshot.get("positions", {}).items()
+    )
+    return {
+        "pnl": round(snapshot.get("realized", 0.0) + unrealized, 2),
+        "realized": snapshot.get("realized", 0.0),
+        "unrealized": round(unrealized, 2),
+    }
@@ -2,9 +2,13 @@ import asyncio
 import logging
 import os
 import json
+from typing import Optional
 from redis.asyncio import Redis
 from src.data.models import Order, Trade
 from src.engine.exchange import Exchange
+from src.engine.positions import PositionBook
+from src.infra.redis_pool import get_redis
+from src.infra.trade_store import TradeStore, TradeStoreWriteError
 
 logging.basicConfig(
     level=logging.INFO,
@@ -14,29 +18,55 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+TRADE_FLUSH_INTERVAL = float(os.getenv("TRADE_FLUSH_INTERVAL", "5"))
+LEADERBOARD_INTERVAL = float(os.getenv("LEADERBOARD_INTERVAL", "1"))
 
 class MarketService:
-    def __init__(self):
-        self.redis = Redis.from_url(REDIS_URL, decode_responses=True)
+    def __init__(self, redis: Optional[Redis] = None):
+        self.redis = redis or get_redis()
         self.exchange = Exchange()
         self.pubsub = self.redis.pubsub()
+        self.trade_store = TradeStore()
+        self.positions = PositionBook()
+        self._leaderboard_dirty = False
 
     async def start(self):
         """Inicia o loop principal de consumo de mensagens."""
         logger.info(f"Market Engine iniciando... Conectado em {REDIS_URL}")
 
-        await self.pubsub.subscribe("market:orders")
-        logger.info("Escutando canal 'market:orders'...")
+        persist_task = asyncio.create_task(self.persist_trades())
+        leaderboard_task = asyncio.create_task(self.publish_leaderboard_loop())
 
+        backoff = 1.0
         try:
-            async for message in self.pubsub.listen():
-                if message["type"] == "message":
-                    await self.process_message(message["data"])
+            while True:
+                try:
+                    await self.pubsub.subscribe("market:orders")
+                    logger.info("Escutando canal 'market:orders'...")
+                    backoff = 1.0
+
+                    async for message in self.pubsub.listen():
+                        if message["type"] == "message":
+                            await self.process_message(message["data"])
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Reinscreve com backoff exponencial em vez de derrubar o engine
+                    logger.error(f"Erro no loop de mensagens: {e}. Reinscrevendo em {backoff:.0f}s...", exc_info=True)
+                    await self.pubsub.aclose()
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 30.0)
+                    self.pubsub = self.redis.pubsub()
         except asyncio.CancelledError:
             logger.info("Serviço interrompido.")
-        except Exception as e:
-            logger.error(f"Erro crítico no loop: {e}", exc_info=True)
         finally:
+            persist_task.cancel()
+            leaderboard_task.cancel()
+            try:
+                self.trade_store.flush()
+            except Exception as e:
+                logger.error(f"Erro ao persistir trades no encerramento: {e}")
+            await self.pubsub.aclose()
             await self.redis.close()
 
     async def process_message(self, data: str):
@@ -57,10 +87,28 @@ class MarketService:
         except Exception as e:
             logger.error(f"Erro ao processar mensagem: {data} | Erro: {e}")
 
+    async def persist_trades(self):
+        """Descarrega periodicamente o buffer de trades no TradeStore, fora do event loop."""
+        while True:
+            await asyncio.sleep(TRADE_FLUSH_INTERVAL)
+            rows = self.trade_store.drain()
+            if rows:
+                try:
+                    await asyncio.to_thread(self.trade_store.write, rows)
+                except TradeStoreWriteError as e:
+                    # só as linhas não gravadas voltam ao buffer, para não duplicar
+                    self.trade_store.requeue(e.rows)
+                    logger.error(f"Erro ao persistir trades, nova tentativa no próximo flush: {e}")
+                except Exception as e:
+                    self.trade_store.requeue(rows)
+                    logger.error(f"Erro ao persistir {len(rows)} trades, nova tentativa no próximo flush: {e}")
+
     async def publish_trades(self, trades: list[Trade]):
         """Publica os trades executados para o Ticker."""
         for trade in trades:
             trade_json = trade.model_dump_json()
+            self.trade_store.append(trade)
+            self.positions.on_trade(trade)
 
             await self.redis.publish("market:ticker", trade_json)
             await self.redis.set("market:last_trade", trade_json)
@@ -69,6 +117,39 @@ class MarketService:
 
             logger.info(f"TRADE EXECUTADO: {trade.quantity} {trade.asset.value} @ ${trade.price} ({trade.buyer_agent_id} -> {trade.seller_agent_id})")
 
+        await self.publish_positions(trades)
+
+    async def publish_positions(self, trades: list[Trade]):
+        """
+        Atualiza os snapshots dos agentes envolvidos e os preços de marcação.
+        O PnL de cada agente é calculado por quem lê (mark_to_market), então os
+        demais detentores do ativo não precisam ser reescritos quando o preço muda.
+        """
+        touched = {t.buyer_agent_id for t in trades} | {t.seller_agent_id for t in trades}
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset("market:positions", mapping={
+                agent_id: json.dumps(self.positions.snapshot(agent_id)) for agent_id in touched
+            })
+            pipe.hset("market:marks", mapping=self.positions.mark_prices())
+            await pipe.execute()
+
+        self._leaderboard_dirty = True
+
+    async def publish_leaderboard(self):
+        await self.redis.set("market:leaderboard", json.dumps(self.positions.leaderboard()))
+        self._leaderboard_dirty = False
+
+    async def publish_leaderboard_loop(self):
+        """O leaderboard é O(N) nos agentes: publicado no máximo a cada LEADERBOARD_INTERVAL."""
+        while True:
+            await asyncio.sleep(LEADERBOARD_INTERVAL)
+            if self._leaderboard_dirty:
+                try:
+                    await self.publish_leaderboard()
+                except Exception as e:
+                    logger.error(f"Erro ao publicar leaderboard: {e}")
+
 if __name__ == "__main__":
     try:
         service = MarketService()
@@ -0,0 +1,73 @@
+import os
+from datetime import datetime
+from typing import Any, Optional
+from redis.asyncio import Redis
+
+AGENT_LOG_STREAM = "agent:log_stream"
+AGENT_LOG_MAXLEN = int(os.getenv("AGENT_LOG_MAXLEN", "1000"))
+
+def build_log_event(state: dict, action: str) -> dict[str, str]:
+    """
+    Evento estruturado de decisão de um agente (inclusive WAIT e ordens rejeitadas).
+    Streams do Redis só guardam strings, então todos os campos são serializados aqui.
+    """
+    details = state.get("order_details") or {}
+    meta = state.get("decision_meta") or {}
+
+    event: dict[str, Any] = {
+        "timestamp": datetime.now().isoformat(),
+        "agent_id": state["agent_id"],
+        "role": state.get("role"),
+        "action": action,
+        "asset": details.get("asset"),
+        "side": details.get("side"),
+        "price": details.get("price"),
+        "quantity": details.get("quantity"),
+        "thought_process": state.get("thought_process"),
+        "news_id": state.get("news_id"),
+        "source": meta.get("source"),
+        "latency_ms": meta.get("latency_ms"),
+        "tokens_in": meta.get("tokens_in"),
+        "tokens_out": meta.get("tokens_out"),
+    }
+    return {k: "" if v is None else str(getattr(v, "value", v)) for k, v in event.items()}
+
+def decode_entries(entries) -> list[tuple[str, dict]]:
+    """Normaliza a resposta de XRANGE/XREAD em [(id, campos)], com ou sem decode_responses."""
+    decoded = []
+    for entry_id, fields in entries or []:
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode()
+            fields = {k.decode(): v.decode() for k, v in fields.items()}
+        decoded.append((entry_id, fields))
+    return decoded
+
+class AgentLogStream:
+    """
+    Log de decisões dos agentes num Redis Stream limitado (XADD MAXLEN ~).
+    Consumidores leem de forma incremental com `read_since(last_id)`.
+    """
+
+    def __init__(self, redis: Redis, maxlen: int = AGENT_LOG_MAXLEN):
+        self.redis = redis
+        self.maxlen = maxlen
+
+    def add(self, pipe, event: dict[str, str]):
+        """Enfileira o XADD num pipeline já aberto (o chamador executa)."""
+        pipe.xadd(AGENT_LOG_STREAM, event, maxlen=self.maxlen, approximate=True)
+
+    async def append(self, event: dict[str, str]) -> str:
+        return await self.redis.xadd(AGENT_LOG_STREAM, event, maxlen=self.maxlen, approximate=True)
+
+    async def read_since(self, last_id: str = "0-0", count: int = 100, block_ms: Optional[int] = None) -> list[tuple[str, dict]]:
+        """Eventos com id maior que `last_id`. Com `block_ms`, espera por novos eventos."""
+        response = await self.redis.xread({AGENT_LOG_STREAM: last_id}, count=count, block=block_ms)
+        if not response:
+            return []
+        _, entries = response[0]
+        return decode_entries(entries)
+
+    async def latest(self, count: int = 10) -> list[tuple[str, dict]]:
+        """Últimos `count` eventos, do mais antigo para o mais recente."""
+        entries = await self.redis.xrevrange(AGENT_LOG_STREAM, count=count)
+        return list(reversed(decode_entries(entries)))
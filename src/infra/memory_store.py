@@ -1,11 +1,7 @@
 import logging
-import numpy as np
 import json
-from redis.asyncio import Redis
-from redis.commands.search.field import TextField, VectorField, TagField
-from redis.commands.search.index_definition import IndexDefinition, IndexType
-from redis.commands.search.query import Query
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from functools import cached_property
+from src.infra.redis_pool import get_redis
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +10,16 @@ VECTOR_DIM = 768
 
 class MemoryStore:
     def __init__(self, redis_url: str, api_key: str):
-        self.redis = Redis.from_url(redis_url, decode_responses=False)
-        self.embeddings = GoogleGenerativeAIEmbeddings(
+        self.redis = get_redis(redis_url, decode_responses=False)
+        self.api_key = api_key
+
+    @cached_property
+    def embeddings(self):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        return GoogleGenerativeAIEmbeddings(
             model="models/text-embedding-004", 
-            google_api_key=api_key
+            google_api_key=self.api_key
         )
 
     async def init_index(self):
@@ -27,6 +29,9 @@ class MemoryStore:
             logger.info("Índice de memória já existe.")
         except:
             logger.info("Criando novo índice vetorial...")
+            from redis.commands.search.field import TextField, VectorField, TagField
+            from redis.commands.search.index_definition import IndexDefinition, IndexType
+
             schema = (
                 TagField("agent_id"),
                 TextField("content"),
@@ -43,6 +48,8 @@ class MemoryStore:
 
     async def save_memory(self, agent_id: str, content: str):
         """Gera o embedding e salva no Redis."""
+        import numpy as np
+
         try:
             vector = await self.embeddings.aembed_query(content)
             vector_bytes = np.array(vector, dtype=np.float32).tobytes()
@@ -59,6 +66,9 @@ class MemoryStore:
 
     async def recall_memories(self, agent_id: str, context_query: str, k=3) -> str:
         """Busca as 'k' memórias mais parecidas com o contexto atual."""
+        import numpy as np
+        from redis.commands.search.query import Query
+
         try:
             query_vector = await self.embeddings.aembed_query(context_query)
             query_bytes = np.array(query_vector, dtype=np.float32).tobytes()
@@ -0,0 +1,43 @@
+import os
+from redis.asyncio import Redis, BlockingConnectionPool
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "20"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+REDIS_RETRIES = int(os.getenv("REDIS_RETRIES", "5"))
+
+_pools: dict[tuple[str, bool], BlockingConnectionPool] = {}
+
+def get_pool(url: str = REDIS_URL, decode_responses: bool = True) -> BlockingConnectionPool:
+    """
+    Pool compartilhado por processo para cada (url, decode_responses).
+    Bloqueante: com o pool cheio, o comando espera uma conexão livre
+    (até REDIS_POOL_TIMEOUT) em vez de abrir conexões sem limite.
+    """
+    key = (url, decode_responses)
+    if key not in _pools:
+        _pools[key] = BlockingConnectionPool.from_url(
+            url,
+            decode_responses=decode_responses,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT,
+            socket_keepalive=True,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+            retry=Retry(ExponentialBackoff(cap=10, base=0.1), REDIS_RETRIES),
+            retry_on_error=[ConnectionError, TimeoutError],
+        )
+    return _pools[key]
+
+def get_redis(url: str = REDIS_URL, decode_responses: bool = True) -> Redis:
+    """Cliente Redis sobre o pool compartilhado (fechar o cliente não fecha o pool)."""
+    return Redis(connection_pool=get_pool(url, decode_responses))
+
+async def close_pools():
+    """Fecha as conexões de todos os pools do processo (chamar no encerramento)."""
+    for pool in _pools.values():
+        await pool.disconnect()
+    _pools.clear()
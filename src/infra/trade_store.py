@@ -0,0 +1,292 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Union
+import numpy as np
+
+from src.data.models import Trade
+
+logger = logging.getLogger(__name__)
+
+TRADE_STORE_DIR = os.getenv("TRADE_STORE_DIR", "data/trades")
+
+# uma coluna = um arquivo por hora; strings (agentes, ativos) viram códigos inteiros
+COLUMNS = {
+    "ts": np.dtype("f8"),        # epoch (s)
+    "price": np.dtype("f8"),
+    "quantity": np.dtype("i8"),
+    "asset": np.dtype("i4"),     # código em assets.jsonl
+    "buyer": np.dtype("i4"),     # código em agents.jsonl
+    "seller": np.dtype("i4"),
+}
+
+TimeLike = Union[datetime, float, None]
+
+def _epoch(value: TimeLike) -> Optional[float]:
+    if value is None:
+        return None
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
+def _hour_key(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y%m%d%H")
+
+class TradeStoreWriteError(Exception):
+    """Falha ao gravar; `rows` são as linhas que não chegaram ao disco."""
+
+    def __init__(self, rows: list[tuple], cause: Exception):
+        super().__init__(f"{len(rows)} trades não gravados: {cause}")
+        self.rows = rows
+
+class Dictionary:
+    """
+    Strings internadas em códigos inteiros (posição no arquivo), persistidas
+    como JSON lines append-only. Ids de qualquer tamanho, sem truncar.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+        self._offset = 0
+
+    def refresh(self):
+        """Lê as entradas gravadas desde a última leitura (ignora uma linha incompleta)."""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            self._add(json.loads(line))
+        self._offset += end
+
+    def _add(self, value: str):
+        self.codes[value] = len(self.values)
+        self.values.append(value)
+
+    def encode(self, values: list[str]) -> np.ndarray:
+        """Códigos dos valores; os novos são gravados antes de serem usados nas colunas."""
+        new = list(dict.fromkeys(v for v in values if v not in self.codes))
+        if new:
+            payload = "".join(json.dumps(v) + "\n" for v in new).encode()
+            with open(self.path, "ab") as f:
+                f.truncate(self._offset)  # descarta uma linha incompleta de escrita anterior
+                f.write(payload)
+            self._offset += len(payload)
+            for value in new:
+                self._add(value)
+        return np.array([self.codes[v] for v in values], dtype=COLUMNS["buyer"])
+
+class TradeStore:
+    """
+    Histórico colunar de trades em disco, fora do Redis e do hot path do matching.
+
+    Layout: um diretório por hora, `<root>/<YYYYMMDDHH>/`, com um arquivo por
+    coluna (`ts.bin`, `price.bin`, ...; ver COLUMNS). Agentes e ativos são
+    gravados como códigos de `agents.jsonl`/`assets.jsonl`. Cada flush só faz
+    append nas colunas da hora; a leitura usa np.memmap e só toca as colunas e
+    as horas que a consulta precisa.
+    """
+
+    def __init__(self, root: Union[str, Path] = TRADE_STORE_DIR):
+        self.root = Path(root)
+        self.agents = Dictionary(self.root / "agents.jsonl")
+        self.assets = Dictionary(self.root / "assets.jsonl")
+        self._buffer: list[tuple] = []
+        self._write_lock = threading.Lock()
+
+    # --- escrita ---
+
+    def append(self, trade: Trade):
+        """O(1): só bufferiza. A escrita em disco acontece em `flush`."""
+        self._buffer.append((
+            trade.timestamp.timestamp(),
+            trade.asset.value,
+            float(trade.price),
+            trade.quantity,
+            trade.buyer_agent_id,
+            trade.seller_agent_id,
+        ))
+
+    def drain(self) -> list[tuple]:
+        rows, self._buffer = self._buffer, []
+        return rows
+
+    def requeue(self, rows: list[tuple]):
+        """Devolve linhas não gravadas ao início do buffer (próximo flush tenta de novo)."""
+        self._buffer[:0] = rows
+
+    @staticmethod
+    def _count(hour_dir: Path) -> int:
+        """Linhas completas da hora: a menor coluna (uma escrita pode ter falhado no meio)."""
+        sizes = []
+        for name, dtype in COLUMNS.items():
+            path = hour_dir / f"{name}.bin"
+            sizes.append(path.stat().st_size // dtype.itemsize if path.exists() else 0)
+        return min(sizes)
+
+    def write(self, rows: list[tuple]) -> int:
+        """
+        Faz append das linhas nas colunas de cada hora (bloqueante; rode fora do event loop).
+        Em caso de erro levanta TradeStoreWriteError com as linhas das horas não gravadas.
+        """
+        if not rows:
+            return 0
+
+        ts, assets, prices, quantities, buyers, sellers = zip(*rows)
+        hours = np.array([_hour_key(t) for t in ts])
+        pending = list(np.unique(hours))
+
+        with self._write_lock:
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                self.agents.refresh()
+                self.assets.refresh()
+                agent_codes = self.agents.encode(list(buyers + sellers))
+                columns = {
+                    "ts": np.array(ts, dtype=COLUMNS["ts"]),
+                    "price": np.array(prices, dtype=COLUMNS["price"]),
+                    "quantity": np.array(quantities, dtype=COLUMNS["quantity"]),
+                    "asset": self.assets.encode(list(assets)),
+                    "buyer": agent_codes[:len(rows)],
+                    "seller": agent_codes[len(rows):],
+                }
+            except OSError as e:
+                raise TradeStoreWriteError(rows, e) from e
+
+            while pending:
+                hour = pending[0]
+                try:
+                    hour_dir = self.root / hour
+                    hour_dir.mkdir(exist_ok=True)
+                    committed = self._count(hour_dir)
+                    mask = hours == hour
+                    for name, dtype in COLUMNS.items():
+                        with open(hour_dir / f"{name}.bin", "ab") as f:
+                            # descarta linhas que só chegaram a parte das colunas
+                            f.truncate(committed * dtype.itemsize)
+                            f.write(columns[name][mask].tobytes())
+                except OSError as e:
+                    unwritten = [row for row, h in zip(rows, hours) if h in pending]
+                    raise TradeStoreWriteError(unwritten, e) from e
+                pending.pop(0)
+
+        return len(rows)
+
+    def flush(self) -> int:
+        return self.write(self.drain())
+
+    # --- leitura ---
+
+    def load(
+        self,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        asset: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        columns: Iterable[str] = tuple(COLUMNS),
+    ) -> dict[str, np.ndarray]:
+        """Colunas pedidas dos trades no intervalo [start, end), ordenadas por tempo."""
+        wanted = list(dict.fromkeys(["ts", *columns]))
+        empty = {name: np.empty(0, dtype=COLUMNS[name]) for name in wanted}
+
+        self.agents.refresh()
+        self.assets.refresh()
+        asset_code = self.assets.codes.get(getattr(asset, "value", asset)) if asset is not None else None
+        agent_code = self.agents.codes.get(agent_id) if agent_id is not None else None
+        if (asset is not None and asset_code is None) or (agent_id is not None and agent_code is None):
+            return empty
+
+        t0, t1 = _epoch(start), _epoch(end)
+        first = _hour_key(t0) if t0 is not None else None
+        last = _hour_key(t1) if t1 is not None else None
+
+        chunks = []
+        hours = sorted(p for p in self.root.iterdir() if p.is_dir()) if self.root.exists() else []
+        for hour_dir in hours:
+            hour = hour_dir.name
+            if (first and hour < first) or (last and hour > last):
+                continue
+            count = self._count(hour_dir)
+            if count == 0:
+                continue
+
+            def column(name: str) -> np.ndarray:
+                return np.memmap(hour_dir / f"{name}.bin", dtype=COLUMNS[name], mode="r", shape=(count,))
+
+            mask = np.ones(count, dtype=bool)
+            if t0 is not None:
+                mask &= column("ts") >= t0
+            if t1 is not None:
+                mask &= column("ts") < t1
+            if asset_code is not None:
+                mask &= column("asset") == asset_code
+            if agent_code is not None:
+                mask &= (column("buyer") == agent_code) | (column("seller") == agent_code)
+            chunks.append({name: np.array(column(name)[mask]) for name in wanted})
+
+        if not chunks:
+            return empty
+
+        data = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in wanted}
+        order = np.argsort(data["ts"], kind="stable")
+        return {name: values[order] for name, values in data.items()}
+
+    def volume(self, asset: Optional[str] = None, agent_id: Optional[str] = None, start: TimeLike = None, end: TimeLike = None) -> int:
+        return int(self.load(start, end, asset, agent_id, columns=("quantity",))["quantity"].sum())
+
+    def vwap(self, asset: str, agent_id: Optional[str] = None, start: TimeLike = None, end: TimeLike = None) -> Optional[float]:
+        trades = self.load(start, end, asset, agent_id, columns=("price", "quantity"))
+        qty = trades["quantity"].sum()
+        if qty == 0:
+            return None
+        return float((trades["price"] * trades["quantity"]).sum() / qty)
+
+    def price_series(self, asset: str, start: TimeLike = None, end: TimeLike = None) -> tuple[np.ndarray, np.ndarray]:
+        """(timestamps, preços) de cada trade do ativo."""
+        trades = self.load(start, end, asset, columns=("price",))
+        return trades["ts"], trades["price"]
+
+    def pnl(self, agent_id: Optional[str] = None, start: TimeLike = None, end: TimeLike = None) -> dict[str, float]:
+        """
+        PnL por agente no intervalo: fluxo de caixa dos trades + posição líquida
+        marcada ao último preço de mercado de cada ativo no mesmo intervalo.
+        Vetorizado: O(trades) com np.unique + np.bincount, sem laço por agente.
+        """
+        trades = self.load(start, end, columns=("asset", "price", "quantity", "buyer", "seller"))
+        if len(trades["ts"]) == 0:
+            return {}
+
+        # último preço de mercado por ativo (trades já estão ordenados por tempo),
+        # calculado antes de filtrar pelo agente
+        assets = trades["asset"]
+        last = len(assets) - 1 - np.unique(assets[::-1], return_index=True)[1]
+        marks = np.zeros(assets.max() + 1)
+        marks[assets[last]] = trades["price"][last]
+
+        if agent_id is not None:
+            code = self.agents.codes.get(agent_id)
+            keep = (trades["buyer"] == code) | (trades["seller"] == code)
+            trades = {name: values[keep] for name, values in trades.items()}
+            if not keep.any():
+                return {}
+
+        # comprador: -valor pago + quantidade marcada; vendedor: o oposto
+        flow = (marks[trades["asset"]] - trades["price"]) * trades["quantity"]
+        agents, inverse = np.unique(np.concatenate([trades["buyer"], trades["seller"]]), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate([flow, -flow]), minlength=len(agents))
+
+        result = {self.agents.values[code]: float(total) for code, total in zip(agents, totals)}
+        if agent_id is not None:
+            return {agent_id: result[agent_id]}
+        return result
+
+if __name__ == "__main__":
+    store = TradeStore()
+    for code in np.unique(store.load(columns=("asset",))["asset"]):
+        asset = store.assets.values[code]
+        print(f"{asset}: volume={store.volume(asset)} vwap={store.vwap(asset):.2f}")
@@ -1,19 +1,19 @@
 import asyncio
-import os
-from redis.asyncio import Redis
 from src.engine.service import MarketService
 from src.engine.news import broadcast_news
-
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+from src.infra.redis_pool import close_pools, get_redis
 
 async def main():
-    redis_news = Redis.from_url(REDIS_URL, decode_responses=True)
+    redis_news = get_redis()
     service = MarketService()
     
-    await asyncio.gather(
-        service.start(),
-        broadcast_news(redis_news)
-    )
+    try:
+        await asyncio.gather(
+            service.start(),
+            broadcast_news(redis_news)
+        )
+    finally:
+        await close_pools()
 
 if __name__ == "__main__":
     try:
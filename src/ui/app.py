@@ -7,6 +7,9 @@ import random
 import os
 from datetime import datetime
 import uuid
+from collections import deque
+from src.engine.news import NEWS_CHANNEL, NEWS_HISTORY_KEY, NEWS_HISTORY_MAX, NEWS_SEQ_KEY, build_news_event
+from src.infra.agent_log import AGENT_LOG_STREAM, decode_entries
 
 st.set_page_config(layout="wide", page_title="Multi-Agent Marketplace Simulation")
 
@@ -86,20 +89,30 @@ if st.sidebar.button("🔥 INJETAR NOTÍCIA (CAOS)"):
 
     randomized_chaos = random.SystemRandom(chaos)
     chaos_message = randomized_chaos.sample(chaos, len(chaos))
-    news = {
-        "type": "NEWS",
-        "content": chaos_message[0],
-        "timestamp": datetime.now().isoformat()
-    }
-    r.publish("market:news", json.dumps(news))
-    r.lpush("market:news_history", json.dumps(news))
+    news = json.dumps(build_news_event(r.incr(NEWS_SEQ_KEY), chaos_message[0]))
+    pipe = r.pipeline(transaction=False)
+    pipe.publish(NEWS_CHANNEL, news)
+    pipe.lpush(NEWS_HISTORY_KEY, news)
+    pipe.ltrim(NEWS_HISTORY_KEY, 0, NEWS_HISTORY_MAX - 1)
+    pipe.execute()
     st.toast("Notícia de Crise Enviada!", icon="🔥")
 
 st.title("🚀🤖 Multi-Agent Marketplace Simulation 🤖🚀")
 
 placeholder = st.empty()
 
+# Feed incremental: só os eventos novos do stream são lidos a cada segundo
+recent_logs = deque(decode_entries(r.xrevrange(AGENT_LOG_STREAM, count=10))[::-1], maxlen=10)
+last_log_id = recent_logs[-1][0] if recent_logs else "0-0"
+
 while True:
+    new_logs = r.xread({AGENT_LOG_STREAM: last_log_id}, count=100)
+    if new_logs:
+        for entry_id, fields in decode_entries(new_logs[0][1]):
+            recent_logs.append((entry_id, fields))
+            last_log_id = entry_id
+
+
     with placeholder.container():
         col1, col2, col3 = st.columns(3)
 
@@ -113,8 +126,18 @@ while True:
         col3.metric("💰 GOLD Price", f"${p_gold:.2f}", border=True)
         col1.metric("💵 Dolar Price", f"${p_dolar:.2f}", border=True)
 
+        leaderboard = json.loads(r.get("market:leaderboard") or "[]")
+        if leaderboard:
+            st.subheader("🏆 Leaderboard (PnL)")
+            st.dataframe(
+                pd.DataFrame(leaderboard),
+                column_config={"rank": "#", "agent_id": "Agente", "pnl": st.column_config.NumberColumn("PnL", format="$%.2f")},
+                hide_index=True,
+                width="stretch"
+            )
+
         st.subheader("📰 News Feed")
-        latest_news = r.lrange("market:news_history", 0, 0)
+        latest_news = r.lrange(NEWS_HISTORY_KEY, 0, 0)
         if latest_news:
             news_data = json.loads(latest_news[0])
             st.info(f"**{news_data['timestamp'][11:19]}**: {news_data['content']}")
@@ -122,18 +145,20 @@ while True:
             st.caption("Sem notícias recentes.")
 
         st.subheader("🧠 Agent Live Feed")
-        logs_raw = r.lrange("agent:logs", 0, 9)
         
-        if logs_raw:
-            logs_data = [json.loads(log) for log in logs_raw]
-            df_logs = pd.DataFrame(logs_data)
+        if recent_logs:
+            df_logs = pd.DataFrame([fields for _, fields in reversed(recent_logs)])
+            df_logs["timestamp"] = df_logs["timestamp"].str[11:19]
+            df_logs["action"] = (df_logs["action"] + " " + df_logs["side"] + " " + df_logs["asset"]).str.strip()
             st.dataframe(
-                df_logs, 
+                df_logs[["timestamp", "agent_id", "action", "thought_process", "source", "latency_ms"]],
                 column_config={
                     "timestamp": "Hora",
                     "agent_id": "Agente",
                     "action": "Ação",
-                    "reasoning": "Pensamento (RAG)"
+                    "thought_process": "Pensamento (RAG)",
+                    "source": "Origem",
+                    "latency_ms": "Latência (ms)"
                 },
                 hide_index=True,
                 width="stretch"
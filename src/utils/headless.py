@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from typing import Optional
+
+from src.data.models import AssetType, Order, OrderSide, OrderType, Trade
+from src.agents.models import AgentBrainState
+from src.agents.policies import HeuristicPolicy
+from src.agents.roles import build_agent_states
+from src.engine.bus import EventBus, SimClock
+from src.engine.headless import HeadlessMarket, Reservations
+from src.engine.news import NEWS_CHANNEL, NEWS_SCENARIOS, build_news_event
+from src.engine.positions import PositionBook
+from src.infra.trade_store import TradeStore
+
+logger = logging.getLogger(__name__)
+
+TRADED_ASSETS = (AssetType.WOOD, AssetType.FOOD)
+
+# trades headless nunca vão para o TRADE_STORE_DIR do engine: os timestamps são do SimClock
+HEADLESS_STORE_DIR = "data/headless"
+
+@dataclass
+class HeadlessConfig:
+    n_agents: int = 20
+    rounds: int = 100
+    round_seconds: float = 5.0
+    news_interval: float = 60.0
+    tick_size: float = 0.01 # imposto pelo mercado headless a toda ordem, qualquer que seja a policy
+    initial_price: float = 10.0
+    balance_scale: float = 1.0 # multiplica gold/dolar iniciais de cada papel
+    roles_config: Optional[list[tuple]] = None
+    seed: Optional[int] = None
+
+@dataclass
+class HeadlessResult:
+    config: HeadlessConfig
+    trades: list[Trade]
+    spreads: dict[str, list[float]]
+    positions: PositionBook
+    agents: list[AgentBrainState]
+    news_count: int = 0
+    sim_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    orders: int = 0
+    rejected: int = 0
+
+def snap_to_tick(price: float, tick_size: float, side: OrderSide) -> Decimal:
+    """Preço no múltiplo de `tick_size` mais próximo que não piora o limite (bid para baixo, ask para cima)."""
+    tick = Decimal(str(tick_size))
+    rounding = ROUND_FLOOR if side == OrderSide.BID else ROUND_CEILING
+    return max((Decimal(str(price)) / tick).to_integral_value(rounding) * tick, tick)
+
+def order_from_decision(
+    state: AgentBrainState,
+    clock: SimClock,
+    reservations: Optional[Reservations] = None,
+    tick_size: Optional[float] = None,
+) -> Optional[Order]:
+    """
+    Mesma validação de saldo/estoque de AgentBrain.execute_order, descontando
+    o que já está comprometido por ordens do agente em repouso no book.
+    Com `tick_size`, o preço é ajustado ao tick antes da validação.
+    """
+    details = state.get("order_details")
+    if state.get("chosen_action") != "PLACE_ORDER" or not details:
+        return None
+
+    price = Decimal(str(details["price"]))
+    if tick_size:
+        price = snap_to_tick(details["price"], tick_size, details["side"])
+
+    agent_id = state["agent_id"]
+    if details["side"] == OrderSide.BID:
+        reserved = reservations.gold_reserved(agent_id) if reservations else 0.0
+        if state["gold"] - reserved < float(price) * details["quantity"]:
+            return None
+    else:
+        reserved = reservations.inventory_reserved(agent_id, details["asset"]) if reservations else 0
+        if state["inventory"].get(details["asset"], 0) - reserved < details["quantity"]:
+            return None
+
+    return Order(
+        agent_id=state["agent_id"],
+        asset=details["asset"],
+        side=details["side"],
+        type=details.get("type", OrderType.LIMIT),
+        price=price,
+        quantity=details["quantity"],
+        timestamp=clock.now(),
+    )
+
+def observe_market(state: AgentBrainState, book: dict[str, dict]) -> dict:
+    """
+    MarketObservation de topo (best_bid/best_ask/last_price/trend) para o ativo
+    de que o agente tem mais estoque, como o prompt do LLM e o DecisionCache leem.
+    """
+    inventory = state.get("inventory") or {}
+    asset = max(TRADED_ASSETS, key=lambda a: inventory.get(a, 0))
+    quote = book[asset.value]
+    return {
+        "asset": asset.value,
+        "best_bid": quote["best_bid"],
+        "best_ask": quote["best_ask"],
+        "last_price": quote["reference"],
+        "trend": quote["trend"],
+    }
+
+def store_dir(seed: Optional[int] = None) -> str:
+    """Diretório próprio da execução, para não misturar runs nem o histórico do engine."""
+    return f"{HEADLESS_STORE_DIR}/{datetime.now():%Y%m%d-%H%M%S}-seed{seed}"
+
+def apply_trade(agents: dict[str, AgentBrainState], trade: Trade):
+    value = float(trade.price) * trade.quantity
+    buyer = agents.get(trade.buyer_agent_id)
+    seller = agents.get(trade.seller_agent_id)
+    if buyer:
+        buyer["gold"] -= value
+        buyer["inventory"][trade.asset] = buyer["inventory"].get(trade.asset, 0) + trade.quantity
+    if seller:
+        seller["gold"] += value
+        seller["inventory"][trade.asset] = seller["inventory"].get(trade.asset, 0) - trade.quantity
+
+async def run_headless(config: HeadlessConfig, policy=None, trade_store: Optional[TradeStore] = None) -> HeadlessResult:
+    """
+    Simulação sem Redis e sem tempo real: agentes, Exchange e notícias se falam
+    por um EventBus em processo e o tempo é um SimClock avançado a cada rodada.
+    `policy` é qualquer objeto com `async run_cycle(state)` (padrão: HeuristicPolicy).
+    """
+    started = time.perf_counter()
+    rng = random.Random(config.seed)
+    policy = policy or HeuristicPolicy(seed=config.seed, tick_size=config.tick_size)
+
+    clock = SimClock()
+    if hasattr(policy, "bind_clock"):
+        policy.bind_clock(clock)
+    bus = EventBus()
+    market = HeadlessMarket(bus, clock, trade_store)
+    ticker = bus.subscribe("market:ticker")
+    news_feed = bus.subscribe(NEWS_CHANNEL)
+
+    agent_states = build_agent_states(config.n_agents, config.roles_config)
+    for state in agent_states:
+        state["gold"] *= config.balance_scale
+        state["dolar"] *= config.balance_scale
+    agents = {state["agent_id"]: state for state in agent_states}
+    latest_news: dict = {}
+    previous_price = {asset.value: config.initial_price for asset in TRADED_ASSETS}
+
+    async def consume_ticker():
+        while True:
+            trade = await ticker.get()
+            apply_trade(agents, trade)
+            ticker.task_done()
+
+    async def consume_news():
+        while True:
+            latest_news["event"] = await news_feed.get()
+            news_feed.task_done()
+
+    tasks = [market.start(), asyncio.create_task(consume_ticker()), asyncio.create_task(consume_news())]
+    result = HeadlessResult(
+        config=config,
+        trades=market.trades,
+        spreads={asset.value: [] for asset in TRADED_ASSETS},
+        positions=market.positions,
+        agents=agent_states,
+    )
+
+    try:
+        next_news = config.news_interval
+        for _ in range(config.rounds):
+            clock.advance(config.round_seconds)
+
+            if config.news_interval and clock.elapsed >= next_news:
+                result.news_count += 1
+                event = build_news_event(result.news_count, rng.choice(NEWS_SCENARIOS), clock.now())
+                await bus.publish(NEWS_CHANNEL, event)
+                await bus.join()
+                next_news += config.news_interval
+
+            book = {}
+            for asset in TRADED_ASSETS:
+                quote = market.quote(asset)
+                last = quote["last_price"] or previous_price[asset.value]
+                quote["trend"] = "up" if last > previous_price[asset.value] else "down" if last < previous_price[asset.value] else "flat"
+                quote["reference"] = last
+                previous_price[asset.value] = last
+                book[asset.value] = quote
+                if quote["best_bid"] and quote["best_ask"]:
+                    result.spreads[asset.value].append(quote["best_ask"] - quote["best_bid"])
+
+            event = latest_news.get("event")
+            for state in agent_states:
+                state["market_data"] = {
+                    **state["market_data"],
+                    **observe_market(state, book),
+                    "book": book,
+                    "news": event,
+                    "reference_price": config.initial_price,
+                }
+                state["breaking_news"] = event["content"] if event else None
+                state["news_id"] = event["id"] if event else None
+
+                await policy.run_cycle(state)
+
+                order = order_from_decision(state, clock, market.reservations, config.tick_size)
+                if order is None:
+                    if state.get("chosen_action") == "PLACE_ORDER":
+                        result.rejected += 1
+                    continue
+
+                result.orders += 1
+                await bus.publish("market:orders", order)
+                await bus.join()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if trade_store:
+            trade_store.flush()
+
+    result.sim_seconds = clock.elapsed
+    result.wall_seconds = time.perf_counter() - started
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação headless (sem Redis, relógio simulado).")
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--news-interval", type=float, default=60.0)
+    parser.add_argument("--tick-size", type=float, default=0.01, help="Tick de preço imposto a todas as ordens.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--store", nargs="?", const="", default=None, metavar="DIR",
+        help=f"Persiste os trades num TradeStore em DIR (padrão: um diretório novo em {HEADLESS_STORE_DIR}/).",
+    )
+    args = parser.parse_args()
+
+    config = HeadlessConfig(
+        n_agents=args.agents,
+        rounds=args.rounds,
+        news_interval=args.news_interval,
+        tick_size=args.tick_size,
+        seed=args.seed,
+    )
+    trade_store = None
+    if args.store is not None:
+        trade_store = TradeStore(args.store or store_dir(args.seed))
+        print(f"Trades em {trade_store.root}")
+    result = asyncio.run(run_headless(config, trade_store=trade_store))
+
+    print(f"{config.rounds} rodadas ({result.sim_seconds:.0f}s simulados) em {result.wall_seconds:.2f}s")
+    print(f"Ordens: {result.orders} | Rejeitadas: {result.rejected} | Trades: {len(result.trades)} | Notícias: {result.news_count}")
+    for entry in result.positions.leaderboard(5):
+        print(f"  #{entry['rank']} {entry['agent_id']}: PnL {entry['pnl']:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# Pacotes que não podem ser carregados só por importar os módulos abaixo
+LLM_PACKAGES = ("langchain", "langchain_core", "langchain_google_genai", "langgraph", "google.genai")
+
+# módulo -> pacotes proibidos no import
+ENTRYPOINTS = {
+    "src.main": LLM_PACKAGES,
+    "src.engine.service": LLM_PACKAGES,
+    "src.engine.headless": LLM_PACKAGES,
+    "src.utils.headless": LLM_PACKAGES,
+    "src.agents.brain": LLM_PACKAGES + ("redis.commands.search",),
+    "src.infra.memory_store": LLM_PACKAGES + ("numpy", "redis.commands.search"),
+}
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\s*)(\S+)")
+
+def profile(module: str) -> tuple[int, list[str], list[tuple[int, str]]]:
+    """
+    Importa `module` num processo limpo com `-X importtime`.
+    Retorna (tempo cumulativo em µs, módulos carregados, top imports por tempo cumulativo).
+    """
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {module}:\n{proc.stderr[-2000:]}")
+
+    timings = []
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        if name == module:
+            total = cumulative
+        elif not indent:
+            timings.append((cumulative, name))
+
+    return total, proc.stdout.split(), sorted(timings, reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de tempo de import e checagem de dependências pesadas.")
+    parser.add_argument("--top", type=int, default=5, help="Imports mais lentos a listar por módulo.")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Falha se algum módulo passar deste tempo.")
+    args = parser.parse_args()
+
+    failures = []
+    for module, forbidden in ENTRYPOINTS.items():
+        total, loaded, timings = profile(module)
+        leaked = sorted({m for m in loaded for f in forbidden if m == f or m.startswith(f + ".")})
+
+        print(f"{module}: {total / 1000:.1f} ms")
+        for cumulative, name in timings[:args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+        if leaked:
+            failures.append(f"{module} carrega {', '.join(leaked[:5])}{'...' if len(leaked) > 5 else ''}")
+        if args.budget_ms is not None and total / 1000 > args.budget_ms:
+            failures.append(f"{module} levou {total / 1000:.1f} ms (limite {args.budget_ms} ms)")
+
+    if failures:
+        print("\nFALHAS:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nOK: nenhum import pesado no carregamento.")
+
+if __name__ == "__main__":
+    main()
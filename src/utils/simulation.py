@@ -3,9 +3,10 @@ import asyncio
 import os
 import logging
 from dotenv import load_dotenv
-from redis.asyncio import Redis
 from src.agents.brain import AgentBrain
-from src.data.models import AssetType
+from src.agents.decision_cache import DecisionCache
+from src.agents.roles import build_agent_states
+from src.infra.redis_pool import close_pools, get_redis
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
@@ -18,43 +19,35 @@ async def run_simulation():
         return
 
     logger.info("Inicializando Cérebro Compartilhado (Gemini)...")
+    # DECISION_CACHE_TTL > 0 reutiliza decisões entre agentes do mesmo arquétipo
+    cache_ttl = float(os.getenv("DECISION_CACHE_TTL", "0"))
+    decision_cache = DecisionCache(ttl=cache_ttl) if cache_ttl > 0 else None
+
     try:
-        brain = AgentBrain()
+        brain = AgentBrain(decision_cache=decision_cache)
     except Exception as e:
         logger.error(f"Erro ao conectar com LLM ou Redis: {e}")
         return
 
-    redis_control = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True)
+    redis_control = get_redis()
 
     await brain.memory_store.init_index()
-
-    agents = []
-    roles_config = [
-        ("Market Maker Conversador", "Conservador. Fornece liquidez.", 100000.0, 50000.0),
-        ("Market Maker Speculator", "Agressivo. Fornece liquidez.", 100000.0, 50000.0),
-        ("Speculator", "Agressivo (FOMO).", 5000.0, 10000.0),
-        ("Speculator", "Agressivo (Arbitrário). Gosta de trades curtos. Spreads curtos e ativos baratos para ganhos rápidos.", 5000.0, 10000.0),
-        ("Producer", "Pragmático. Vende para pagar contas.", 1000.0, 60000.0),
-        ("Value Investor", "Analítico. Compra na baixa.", 10000.0, 500000.0),
-        ("Regular_Investor", "Conservador. Gosta de investimentos seguros.", 5000.0, 1000000.0),
-    ]
-
-    for i in range(1, 21):
-        role, persona, gold, dolar = roles_config[i % len(roles_config)]
-        agents.append({
-            "agent_id": f"agent_{i:02d}_{role.replace(' ', '_').lower()}",
-            "role": role,
-            "personality": persona,
-            "gold": gold,
-            "dolar": dolar,
-            "inventory": {AssetType.WOOD: 50, AssetType.FOOD: 50},
-            "market_data": {"best_bid": 0, "best_ask": 0, "last_price": 0, "trend": "flat"},
-            "memories": "",
-            "breaking_news": None,
-            "thought_process": None,
-            "chosen_action": None,
-            "order_details": None
-        })
+    await brain.start_news_listener()
+
+    agents = build_agent_states(20)
+
+    # BATCH_REASONING_SIZE > 1 decide por grupos de agentes do mesmo papel numa única chamada
+    batch_size = int(os.getenv("BATCH_REASONING_SIZE", "0"))
+    turns = [[agent] for agent in agents]
+    if batch_size > 1:
+        by_role: dict[str, list] = {}
+        for agent in agents:
+            by_role.setdefault(agent["role"], []).append(agent)
+        turns = [
+            group[i:i + batch_size]
+            for group in by_role.values()
+            for i in range(0, len(group), batch_size)
+        ]
 
     logger.info(f"Iniciando simulação com {len(agents)} agentes. Pressione Ctrl+C para parar.")
 
@@ -66,7 +59,19 @@ async def run_simulation():
                 await asyncio.sleep(2)
                 continue
 
-            for agent_state in agents:
+            for group in turns:
+                if len(group) > 1:
+                    logger.info(f"\nTurno em grupo: {group[0]['role']} ({len(group)} agentes)")
+
+                    try:
+                        await brain.run_group_cycle(group)
+                    except Exception as e:
+                        logger.error(f"Erro no turno do grupo {group[0]['role']}: {e}")
+
+                    await asyncio.sleep(3)
+                    continue
+
+                agent_state = group[0]
                 logger.info(f"\nTurno: {agent_state['agent_id']} ({agent_state['role']})")
 
                 try:
@@ -80,11 +85,18 @@ async def run_simulation():
 
                 await asyncio.sleep(3)
 
+            if decision_cache:
+                logger.info(f"Cache de decisões: {decision_cache.hits} hits / {decision_cache.misses} misses")
+
             logger.info("Aguardando próximo ciclo de rodadas...")
             await asyncio.sleep(2)
 
     except KeyboardInterrupt:
         logger.info("Simulação interrompida pelo usuário.")
+    finally:
+        if brain._news_task:
+            brain._news_task.cancel()
+        await close_pools()
 
 if __name__ == "__main__":
     asyncio.run(run_simulation())
@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import csv
+import itertools
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Optional
+import numpy as np
+
+from src.agents.roles import ROLES_CONFIG
+from src.utils.headless import HeadlessConfig, HeadlessResult, TRADED_ASSETS, run_headless
+
+logger = logging.getLogger(__name__)
+
+ROLE_MIXES = {
+    "all": ROLES_CONFIG,
+    "no_market_makers": [r for r in ROLES_CONFIG if not r[0].startswith("Market Maker")],
+    "makers_and_speculators": [r for r in ROLES_CONFIG if r[0].startswith(("Market Maker", "Speculator"))],
+    "investors_and_makers": [r for r in ROLES_CONFIG if "Investor" in r[0] or r[0].startswith("Market Maker")],
+}
+
+def summarize(result: HeadlessResult) -> dict:
+    """
+    Métricas de uma simulação: por ativo (volatilidade, spread, volume) e
+    dispersão do PnL dos agentes (a média é sempre zero: PnL é soma zero).
+    """
+    metrics: dict = {
+        "trades": len(result.trades),
+        "orders": result.orders,
+        "rejected": result.rejected,
+        "wall_seconds": round(result.wall_seconds, 3),
+    }
+
+    for asset in TRADED_ASSETS:
+        prices = np.array([float(t.price) for t in result.trades if t.asset == asset])
+        quantities = np.array([t.quantity for t in result.trades if t.asset == asset])
+        returns = np.diff(np.log(prices)) if len(prices) > 1 else np.empty(0)
+        spreads = result.spreads.get(asset.value, [])
+
+        metrics[f"{asset.value}_volume"] = int(quantities.sum())
+        metrics[f"{asset.value}_last_price"] = round(float(prices[-1]), 4) if len(prices) else None
+        metrics[f"{asset.value}_volatility"] = round(float(returns.std()), 6) if len(returns) else None
+        metrics[f"{asset.value}_mean_spread"] = round(float(np.mean(spreads)), 4) if spreads else None
+
+    pnl = result.positions.pnl()
+    metrics["pnl_std"] = round(float(pnl.std()), 2) if len(pnl) else 0.0
+    metrics["pnl_max"] = round(float(pnl.max()), 2) if len(pnl) else 0.0
+    metrics["pnl_min"] = round(float(pnl.min()), 2) if len(pnl) else 0.0
+    return metrics
+
+def run_config(config: HeadlessConfig) -> dict:
+    """Executado em cada processo do pool: uma simulação headless completa."""
+    return summarize(asyncio.run(run_headless(config)))
+
+def build_grid(base: HeadlessConfig, grid: dict[str, list], seeds: int = 1) -> list[tuple[dict, HeadlessConfig]]:
+    """
+    Produto cartesiano dos parâmetros em `grid` (campos de HeadlessConfig;
+    `mix` escolhe um ROLE_MIXES) repetido para `seeds` sementes.
+    """
+    keys = list(grid)
+    runs = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        params = dict(zip(keys, values))
+        overrides = {k: v for k, v in params.items() if k != "mix"}
+        if "mix" in params:
+            overrides["roles_config"] = ROLE_MIXES[params["mix"]]
+        for seed in range(seeds):
+            runs.append(({**params, "seed": seed}, replace(base, **overrides, seed=seed)))
+    return runs
+
+def run_sweep(runs: list[tuple[dict, HeadlessConfig]], workers: Optional[int] = None) -> list[dict]:
+    """Distribui as simulações num ProcessPoolExecutor e junta tudo numa tabela (lista de linhas)."""
+    params, configs = zip(*runs) if runs else ((), ())
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        metrics = list(pool.map(run_config, configs))
+    return [{**p, **m} for p, m in zip(params, metrics)]
+
+def write_csv(rows: list[dict], path: str):
+    fields = list(dict.fromkeys(k for row in rows for k in row))
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep de parâmetros sobre simulações headless em paralelo.")
+    parser.add_argument("--agents", type=int, nargs="+", default=[20])
+    parser.add_argument("--mix", nargs="+", default=["all"], choices=sorted(ROLE_MIXES))
+    parser.add_argument("--balance-scale", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--news-interval", type=float, nargs="+", default=[60.0])
+    parser.add_argument("--tick-size", type=float, nargs="+", default=[0.01], help="Tick de preço imposto pelo mercado headless.")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--seeds", type=int, default=1, help="Repetições por combinação (sementes 0..N-1).")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep.csv")
+    args = parser.parse_args()
+
+    runs = build_grid(
+        HeadlessConfig(rounds=args.rounds),
+        {
+            "n_agents": args.agents,
+            "mix": args.mix,
+            "balance_scale": args.balance_scale,
+            "news_interval": args.news_interval,
+            "tick_size": args.tick_size,
+        },
+        seeds=args.seeds,
+    )
+
+    started = time.perf_counter()
+    rows = run_sweep(runs, args.workers)
+    write_csv(rows, args.out)
+    print(f"{len(rows)} simulações em {time.perf_counter() - started:.1f}s -> {args.out}")
+
+if __name__ == "__main__":
+    main()
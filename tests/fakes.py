@@ -0,0 +1,111 @@
+import asyncio
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hset(self, key, mapping):
+        self.commands.append(("hset", key, mapping))
+        return self
+
+    def set(self, key, value):
+        self.commands.append(("set", key, value))
+        return self
+
+    def publish(self, channel, message):
+        self.commands.append(("publish", channel, message))
+        return self
+
+    def lpush(self, key, value):
+        self.commands.append(("lpush", key, value))
+        return self
+
+    def ltrim(self, key, start, end):
+        self.commands.append(("ltrim", key, start, end))
+        return self
+
+    async def execute(self):
+        for name, *args in self.commands:
+            await getattr(self.redis, name)(*args)
+        self.commands = []
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.setdefault(channel, []).append(self.queue)
+
+    async def unsubscribe(self, channel):
+        self.redis.subscribers.get(channel, []).remove(self.queue)
+
+    async def aclose(self):
+        for queues in self.redis.subscribers.values():
+            if self.queue in queues:
+                queues.remove(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+
+class FakeRedis:
+    """Subconjunto do redis.asyncio.Redis usado pelo engine (hash, string, lista e Pub/Sub)."""
+
+    def __init__(self):
+        self.data = {}
+        self.published = []
+        self.subscribers = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def close(self):
+        pass
+
+    async def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    async def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def set(self, key, value):
+        self.data[key] = value
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        for queue in self.subscribers.get(channel, []):
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    async def lpush(self, key, value):
+        self.data.setdefault(key, []).insert(0, value)
+
+    async def ltrim(self, key, start, end):
+        self.data[key] = self.data.get(key, [])[start:end + 1]
+
+    async def lindex(self, key, index):
+        items = self.data.get(key, [])
+        return items[index] if -len(items) <= index < len(items) else None
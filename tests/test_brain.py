@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_core")
+from langchain_core.runnables import RunnableLambda
+
+from src.agents.brain import AgentBrain
+from src.agents.models import AgentDecision, AgentGroupDecision, AgentGroupDecisionItem
+
+
+def state(agent_id):
+    return {
+        "agent_id": agent_id, "role": "Speculator", "personality": "Agressivo.",
+        "gold": 1000.0, "dolar": 0.0, "inventory": {}, "chosen_action": None, "order_details": None,
+        "market_data": {"best_bid": 9.0, "best_ask": 11.0, "last_price": 10.0, "trend": "flat"},
+    }
+
+
+def wait(thought="esperar"):
+    return AgentDecision(thought_process=thought, action="WAIT", order_details=None)
+
+
+def group_response(agent_ids):
+    items = [AgentGroupDecisionItem(agent_id=a, **wait("grupo").model_dump()) for a in agent_ids]
+    return {"parsed": AgentGroupDecision(decisions=items), "raw": None, "parsing_error": None}
+
+
+def brain_with(group_llm, failing=()):
+    brain = AgentBrain()
+    brain.structured_group_llm = RunnableLambda(group_llm)
+    brain.fallbacks = []
+
+    async def generate_strategy(s):
+        brain.fallbacks.append(s["agent_id"])
+        if s["agent_id"] in failing:
+            raise RuntimeError("quota")
+        return brain._decision_update(wait("individual"), {"source": "llm"})
+
+    brain.generate_strategy = generate_strategy
+    return brain
+
+
+async def missing_agent(_):
+    return group_response(["a1", "a3"])
+
+
+async def unparsed(_):
+    return {"parsed": None, "raw": None, "parsing_error": "json inválido"}
+
+
+async def failing(_):
+    raise RuntimeError("timeout")
+
+
+# a3 sempre falha na chamada individual: fica sem update (None) quando cai no fallback
+@pytest.mark.parametrize("group_llm, fallbacks, thoughts", [
+    (missing_agent, ["a2"], ["grupo", "individual", "grupo"]),
+    (unparsed, ["a1", "a2", "a3"], ["individual", "individual", None]),
+    (failing, ["a1", "a2", "a3"], ["individual", "individual", None]),
+])
+def test_group_fallback_per_agent(group_llm, fallbacks, thoughts):
+    brain = brain_with(group_llm, failing={"a3"})
+    updates = asyncio.run(brain.generate_group_strategy([state("a1"), state("a2"), state("a3")]))
+
+    assert brain.fallbacks == fallbacks
+    assert [u and u["thought_process"] for u in updates] == thoughts
+
+
+def test_group_cycle_keeps_executing_after_one_agent_fails():
+    brain = brain_with(missing_agent)
+    executed = []
+
+    async def perceive(s):
+        return s
+
+    async def execute_order(s):
+        if s["agent_id"] == "a1":
+            raise ConnectionError("redis caiu")
+        executed.append(s["agent_id"])
+
+    brain.perceive_market = perceive
+    brain.execute_order = execute_order
+
+    asyncio.run(brain.run_group_cycle([state("a1"), state("a2"), state("a3")]))
+
+    assert executed == ["a2", "a3"]
@@ -0,0 +1,96 @@
+import pytest
+
+from src.agents.decision_cache import DecisionCache
+from src.agents.models import AgentDecision, OrderDetails
+from src.data.models import AssetType, OrderSide
+from src.engine.bus import SimClock
+
+
+def decision(quantity: int) -> AgentDecision:
+    return AgentDecision(
+        thought_process="comprar",
+        action="PLACE_ORDER",
+        order_details=OrderDetails(asset=AssetType.FOOD, side=OrderSide.BID, price=10.0, quantity=quantity),
+    )
+
+
+def situation(agent_id="agent_01", **changes):
+    state = {
+        "agent_id": agent_id,
+        "role": "Speculator",
+        "personality": "Agressivo (FOMO).",
+        "market_data": {"best_bid": 9.9, "best_ask": 10.1, "last_price": 10.0, "trend": "up"},
+        "news_id": 3,
+        "gold": 5000.0,
+        "dolar": 10000.0,
+        "inventory": {AssetType.WOOD: 50, AssetType.FOOD: 50},
+    }
+    market = changes.pop("market", {})
+    state.update(changes)
+    state["market_data"] = {**state["market_data"], **market}
+    return state
+
+
+def test_equivalent_situations_share_a_fingerprint():
+    cache = DecisionCache()
+    reference = cache.fingerprint(situation())
+
+    # outro agente, preço dentro do mesmo bucket (~2%) e carteira dentro do bucket (~25%)
+    assert cache.fingerprint(situation("agent_09", market={"last_price": 10.02}, gold=5100.0)) == reference
+
+
+@pytest.mark.parametrize("changes", [
+    {"market": {"last_price": 11.0}},
+    {"market": {"best_ask": 12.0}},
+    {"market": {"trend": "down"}},
+    {"news_id": 4},
+    {"gold": 20000.0},
+    {"inventory": {AssetType.WOOD: 5, AssetType.FOOD: 50}},
+    {"role": "Producer"},
+])
+def test_relevant_changes_produce_a_new_fingerprint(changes):
+    cache = DecisionCache()
+    assert cache.fingerprint(situation(**changes)) != cache.fingerprint(situation())
+
+
+def test_entries_expire_after_ttl_on_the_injected_clock():
+    clock = SimClock()
+    cache = DecisionCache(ttl=30, jitter=0, clock=clock.monotonic)
+    cache.put(situation(), decision(5))
+
+    clock.advance(29)
+    assert cache.get(situation()) == decision(5)
+    clock.advance(2)
+    assert cache.get(situation()) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not cache.entries
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = DecisionCache(max_entries=2, jitter=0)
+    first, second, third = (situation(news_id=i) for i in (1, 2, 3))
+    cache.put(first, decision(1))
+    cache.put(second, decision(2))
+
+    assert cache.get(first) is not None  # first passa a ser o mais recente
+    cache.put(third, decision(3))
+
+    assert cache.get(second) is None
+    assert cache.get(first).order_details.quantity == 1
+    assert cache.get(third).order_details.quantity == 3
+
+
+def test_small_quantities_are_jittered_by_at_least_one_unit():
+    cache = DecisionCache(seed=0)
+    quantities = {cache._perturb(decision(10)).order_details.quantity for _ in range(50)}
+
+    assert quantities == {9, 10, 11}
+
+
+def test_jitter_scales_with_quantity_and_keeps_orders_positive():
+    cache = DecisionCache(seed=0)
+    large = [cache._perturb(decision(500)).order_details.quantity for _ in range(200)]
+    single = {cache._perturb(decision(1)).order_details.quantity for _ in range(50)}
+
+    assert min(large) >= 490 and max(large) <= 510 and len(set(large)) > 3
+    assert single == {1, 2}
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+from src.data.models import AssetType, Order, OrderSide
+from src.engine.exchange import OrderBook
+from src.engine.headless import Reservations
+from src.utils.headless import HeadlessConfig, TRADED_ASSETS, observe_market, run_headless
+
+
+def order(agent, side, price, quantity):
+    return Order(agent_id=agent, asset=AssetType.WOOD, side=side, price=Decimal(str(price)), quantity=quantity)
+
+
+def test_reservations_follow_rest_fill_and_self_trade_drop():
+    reservations = Reservations()
+    book = OrderBook(AssetType.WOOD, on_rest_change=reservations.on_rest_change)
+
+    book.process_order(order("A", OrderSide.ASK, 10, 5))
+    book.process_order(order("B", OrderSide.BID, 8, 2))
+    assert reservations.inventory_reserved("A", AssetType.WOOD) == 5
+    assert reservations.gold_reserved("B") == 16.0
+
+    book.process_order(order("B", OrderSide.BID, 10, 3))
+    assert reservations.inventory_reserved("A", AssetType.WOOD) == 2
+    assert reservations.gold_reserved("B") == 16.0
+
+    # ordem de A do outro lado: self-trade prevention descarta o ask em repouso
+    book.process_order(order("A", OrderSide.BID, 9, 1))
+    assert reservations.inventory_reserved("A", AssetType.WOOD) == 0
+    assert reservations.gold_reserved("A") == 9.0
+
+    book.process_order(order("C", OrderSide.ASK, 8, 3))
+    assert reservations.gold_reserved("A") == 0.0
+    assert reservations.gold_reserved("B") == 0.0
+    assert reservations.resting == {}
+
+def test_same_price_and_timestamp_fill_fifo():
+    book = OrderBook(AssetType.WOOD)
+    same_instant = datetime(2025, 1, 1)
+    for i in range(6):
+        book.process_order(order(f"S{i}", OrderSide.ASK, 10, 1).model_copy(update={"timestamp": same_instant}))
+
+    trades = book.process_order(order("B", OrderSide.BID, 10, 6).model_copy(update={"timestamp": same_instant}))
+
+    assert [t.seller_agent_id for t in trades] == [f"S{i}" for i in range(6)]
+
+
+def test_top_level_market_data_carries_the_quote():
+    book = {
+        asset.value: {"best_bid": 9.5, "best_ask": 10.5, "last_price": 0.0, "reference": 10.0, "trend": "flat"}
+        for asset in TRADED_ASSETS
+    }
+    book[AssetType.FOOD.value].update(best_bid=4.0, best_ask=4.2, reference=4.1, trend="up")
+
+    observed = observe_market({"inventory": {AssetType.WOOD: 1, AssetType.FOOD: 5}}, book)
+
+    assert observed == {"asset": "FOOD", "best_bid": 4.0, "best_ask": 4.2, "last_price": 4.1, "trend": "up"}
+
+
+def test_headless_balances_never_go_negative():
+    result = asyncio.run(run_headless(HeadlessConfig(n_agents=50, rounds=300, seed=1)))
+
+    assert result.trades
+    for state in result.agents:
+        assert state["gold"] >= 0
+        assert all(qty >= 0 for qty in state["inventory"].values())
+
+
+def test_orders_are_snapped_to_the_tick():
+    from src.engine.bus import SimClock
+    from src.utils.headless import order_from_decision
+
+    def state(side, price):
+        return {
+            "agent_id": "A", "gold": 1000.0, "inventory": {AssetType.WOOD: 10}, "chosen_action": "PLACE_ORDER",
+            "order_details": {"asset": AssetType.WOOD, "side": side, "price": price, "quantity": 1},
+        }
+
+    assert order_from_decision(state(OrderSide.BID, 10.07), SimClock(), tick_size=0.05).price == Decimal("10.05")
+    assert order_from_decision(state(OrderSide.ASK, 10.07), SimClock(), tick_size=0.05).price == Decimal("10.10")
+    assert order_from_decision(state(OrderSide.BID, 0.01), SimClock(), tick_size=0.05).price == Decimal("0.05")
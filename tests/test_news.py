@@ -0,0 +1,46 @@
+import asyncio
+
+from src.agents.brain import AgentBrain
+from src.engine.news import NewsService
+from tests.fakes import FakeRedis
+
+
+def test_news_published_while_seeding_is_not_missed():
+    async def scenario():
+        redis = FakeRedis()
+        brain = AgentBrain()
+        brain.news = NewsService(redis)
+        await brain.news.publish("Seca atinge FOOD.")
+
+        # notícia publicada entre a leitura do histórico e o início da escuta
+        latest = brain.news.latest
+
+        async def latest_then_publish():
+            event = await latest()
+            await brain.news.publish("Subsídio para WOOD.")
+            return event
+
+        brain.news.latest = latest_then_publish
+
+        await brain.start_news_listener()
+        await asyncio.sleep(0)
+        brain._news_task.cancel()
+        return brain.latest_news
+
+    latest_news = asyncio.run(scenario())
+
+    assert latest_news["id"] == 2
+    assert latest_news["assets"] == ["WOOD"]
+
+
+def test_seed_does_not_overwrite_newer_pushed_news():
+    async def scenario():
+        redis = FakeRedis()
+        brain = AgentBrain()
+        brain.news = NewsService(redis)
+        await brain.news.publish("Seca atinge FOOD.")
+        brain.latest_news = {"id": 5, "content": "mais nova"}
+        await brain._seed_news()
+        return brain.latest_news
+
+    assert asyncio.run(scenario())["id"] == 5
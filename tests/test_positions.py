@@ -0,0 +1,97 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+
+from src.data.models import AssetType, Trade
+from src.engine.positions import ASSET_INDEX, PositionBook, mark_to_market
+from src.engine.service import MarketService
+from tests.fakes import FakeRedis
+
+WOOD = ASSET_INDEX[AssetType.WOOD]
+
+
+def trade(buyer, seller, price, quantity, asset=AssetType.WOOD):
+    return Trade(buyer_agent_id=buyer, seller_agent_id=seller, asset=asset, price=Decimal(str(price)), quantity=quantity)
+
+
+def test_fill_partial_close_realizes_against_avg_cost():
+    book = PositionBook()
+    i = book._index("A")
+    book._fill(i, WOOD, 10, 10.0)
+    book._fill(i, WOOD, 10, 20.0)
+    book._fill(i, WOOD, -5, 25.0)
+
+    assert book.position[i, WOOD] == 15
+    assert book.avg_cost[i, WOOD] == pytest.approx(15.0)
+    assert book.realized[i] == pytest.approx(50.0)
+
+
+def test_fill_full_close_resets_avg_cost():
+    book = PositionBook()
+    i = book._index("A")
+    book._fill(i, WOOD, 10, 10.0)
+    book._fill(i, WOOD, -10, 12.0)
+
+    assert book.position[i, WOOD] == 0
+    assert book.avg_cost[i, WOOD] == 0.0
+    assert book.realized[i] == pytest.approx(20.0)
+    assert book.cash[i] == pytest.approx(20.0)
+
+
+def test_fill_short_gains_when_price_falls():
+    book = PositionBook()
+    i = book._index("A")
+    book._fill(i, WOOD, -10, 10.0)
+    book._fill(i, WOOD, -10, 14.0)
+    book._fill(i, WOOD, 5, 8.0)
+
+    assert book.position[i, WOOD] == -15
+    assert book.avg_cost[i, WOOD] == pytest.approx(12.0)
+    assert book.realized[i] == pytest.approx(20.0)
+
+
+def test_fill_flip_opens_remainder_at_fill_price():
+    book = PositionBook()
+    i = book._index("A")
+    book._fill(i, WOOD, 10, 10.0)
+    book._fill(i, WOOD, -15, 12.0)
+
+    assert book.position[i, WOOD] == -5
+    assert book.avg_cost[i, WOOD] == pytest.approx(12.0)
+    assert book.realized[i] == pytest.approx(20.0)
+
+    book.marks[WOOD] = 11.0
+    assert book.pnl()[i] == pytest.approx(25.0)
+
+
+def test_leaderboard_top_k_is_sorted():
+    book = PositionBook(capacity=2)
+    for n in range(20):
+        book.on_trade(trade(f"buyer_{n}", "seller", 10 + n, 1))
+    book.on_trade(trade("x", "y", 50, 1))
+
+    top = book.leaderboard(3)
+    assert [e["agent_id"] for e in top] == ["buyer_0", "buyer_1", "buyer_2"]
+    assert [e["rank"] for e in top] == [1, 2, 3]
+
+
+def test_published_snapshot_follows_mark_price_of_other_trades():
+    redis = FakeRedis()
+    service = MarketService(redis=redis)
+
+    async def scenario():
+        await service.publish_trades([trade("A", "B", 10, 10)])
+        await service.publish_trades([trade("C", "B", 20, 1)])
+        await service.publish_leaderboard()
+
+    asyncio.run(scenario())
+
+    snapshot = json.loads(redis.data["market:positions"]["A"])
+    marks = {k: float(v) for k, v in redis.data["market:marks"].items()}
+    leaderboard = {e["agent_id"]: e["pnl"] for e in json.loads(redis.data["market:leaderboard"])}
+
+    assert marks == {"WOOD": 20.0}
+    assert mark_to_market(snapshot, marks)["pnl"] == pytest.approx(100.0)
+    assert leaderboard["A"] == pytest.approx(100.0)
@@ -0,0 +1,27 @@
+import asyncio
+
+from redis.asyncio import BlockingConnectionPool
+from redis.exceptions import ConnectionError, TimeoutError
+
+from src.infra import redis_pool
+
+
+def test_clients_share_one_blocking_pool_per_url_with_retries():
+    url = "redis://localhost:6399"
+    first, second = redis_pool.get_redis(url), redis_pool.get_redis(url)
+    pool = first.connection_pool
+
+    assert second.connection_pool is pool
+    assert redis_pool.get_redis(url, decode_responses=False).connection_pool is not pool
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == redis_pool.REDIS_MAX_CONNECTIONS
+    assert pool.timeout == redis_pool.REDIS_POOL_TIMEOUT
+
+    kwargs = pool.connection_kwargs
+    assert kwargs["health_check_interval"] == redis_pool.REDIS_HEALTH_CHECK_INTERVAL
+    assert kwargs["retry"]._retries == redis_pool.REDIS_RETRIES
+    assert {ConnectionError, TimeoutError} <= set(kwargs["retry_on_error"])
+
+    asyncio.run(redis_pool.close_pools())
+    assert redis_pool.get_redis(url).connection_pool is not pool
+    asyncio.run(redis_pool.close_pools())
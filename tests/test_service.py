@@ -0,0 +1,66 @@
+import asyncio
+from decimal import Decimal
+
+from src.data.models import AssetType, Order, OrderSide
+from src.engine import service as service_module
+from src.engine.service import MarketService
+from src.infra.trade_store import TradeStore
+from tests.fakes import FakePubSub, FakeRedis
+
+
+class DroppingPubSub(FakePubSub):
+    """Primeira assinatura: a conexão cai no meio do listen()."""
+
+    async def listen(self):
+        raise ConnectionError("Connection reset by peer")
+        yield
+
+
+class FlakyRedis(FakeRedis):
+    def __init__(self):
+        super().__init__()
+        self.pubsubs = []
+
+    def pubsub(self):
+        pubsub = (DroppingPubSub if not self.pubsubs else FakePubSub)(self)
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+
+def test_engine_resubscribes_after_listen_fails(tmp_path, monkeypatch):
+    real_sleep = asyncio.sleep
+    backoffs = []
+
+    async def fast_sleep(seconds):
+        backoffs.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(service_module.asyncio, "sleep", fast_sleep)
+
+    async def until(predicate):
+        async def poll():
+            while not predicate():
+                await real_sleep(0)
+        await asyncio.wait_for(poll(), timeout=5)
+
+    async def scenario():
+        redis = FlakyRedis()
+        service = MarketService(redis)
+        service.trade_store = TradeStore(tmp_path)
+        task = asyncio.create_task(service.start())
+
+        await until(lambda: redis.subscribers.get("market:orders"))
+
+        order = Order(agent_id="A", asset=AssetType.WOOD, side=OrderSide.BID, price=Decimal("10"), quantity=1)
+        await redis.publish("market:orders", order.model_dump_json())
+        await until(lambda: service.exchange.books[AssetType.WOOD].bids)
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return redis
+
+    redis = asyncio.run(scenario())
+
+    assert len(redis.pubsubs) == 2
+    assert 1.0 in backoffs
+    assert redis.subscribers["market:orders"] == []
@@ -0,0 +1,91 @@
+import builtins
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.data.models import AssetType, Trade
+from src.infra.trade_store import COLUMNS, TradeStore, TradeStoreWriteError
+
+
+def trade(buyer, seller, price, quantity, ts, asset=AssetType.WOOD):
+    return Trade(
+        buyer_agent_id=buyer, seller_agent_id=seller, asset=asset,
+        price=Decimal(str(price)), quantity=quantity, timestamp=ts,
+    )
+
+
+def test_pnl_for_one_agent_uses_market_mark(tmp_path):
+    store = TradeStore(tmp_path)
+    store.append(trade("A", "B", 10, 10, datetime(2025, 1, 1, 10, 0)))
+    store.append(trade("C", "B", 20, 1, datetime(2025, 1, 1, 10, 1)))
+    store.flush()
+
+    assert store.pnl()["A"] == pytest.approx(100.0)
+    assert store.pnl(agent_id="A") == {"A": pytest.approx(100.0)}
+
+
+def test_flushes_append_to_one_file_per_hour(tmp_path):
+    store = TradeStore(tmp_path)
+    for minute in range(3):
+        store.append(trade("A", "B", 10 + minute, 1, datetime(2025, 1, 1, 10, minute)))
+        store.flush()
+    store.append(trade("A", "B", 13, 1, datetime(2025, 1, 1, 11, 0)))
+    store.flush()
+
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == ["2025010110", "2025010111"]
+    assert sorted(p.name for p in (tmp_path / "2025010110").iterdir()) == sorted(f"{c}.bin" for c in COLUMNS)
+    assert store.volume() == 4
+    assert store.vwap("WOOD", start=datetime(2025, 1, 1, 10), end=datetime(2025, 1, 1, 11)) == pytest.approx(11.0)
+
+
+def test_failed_write_returns_rows_for_retry(tmp_path, monkeypatch):
+    store = TradeStore(tmp_path)
+    store.append(trade("A", "B", 10, 1, datetime(2025, 1, 1, 10, 0)))
+    store.append(trade("A", "B", 11, 1, datetime(2025, 1, 1, 11, 0)))
+    rows = store.drain()
+
+    real_open = builtins.open
+
+    def failing_open(path, *args, **kwargs):
+        if "2025010111" in str(path):
+            raise OSError("disk full")
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", failing_open)
+    with pytest.raises(TradeStoreWriteError) as exc:
+        store.write(rows)
+    monkeypatch.setattr(builtins, "open", real_open)
+
+    assert len(exc.value.rows) == 1
+    store.requeue(exc.value.rows)
+    store.flush()
+    assert store.volume() == 2
+
+
+def test_long_agent_ids_round_trip(tmp_path):
+    long_a, long_b = "a" * 100 + "1", "a" * 100 + "2"
+    store = TradeStore(tmp_path)
+    store.append(trade(long_a, long_b, 10, 3, datetime(2025, 1, 1, 10, 0)))
+    store.append(trade(long_b, long_a, 12, 1, datetime(2025, 1, 1, 10, 1)))
+    store.flush()
+
+    # outro leitor (processo) só com o que está em disco
+    reader = TradeStore(tmp_path)
+    assert reader.volume(agent_id=long_a) == 4
+    assert reader.volume(agent_id="a" * 100) == 0
+    assert reader.pnl() == {long_a: pytest.approx(6.0), long_b: pytest.approx(-6.0)}
+
+
+def test_partially_written_columns_are_ignored_and_overwritten(tmp_path):
+    store = TradeStore(tmp_path)
+    store.append(trade("A", "B", 10, 1, datetime(2025, 1, 1, 10, 0)))
+    store.flush()
+    # uma escrita anterior chegou só à primeira coluna
+    with open(tmp_path / "2025010110" / "ts.bin", "ab") as f:
+        f.write(b"\0" * 8)
+
+    assert store.volume() == 1
+    store.append(trade("A", "B", 20, 2, datetime(2025, 1, 1, 10, 5)))
+    store.flush()
+    assert store.vwap("WOOD") == pytest.approx(50 / 3)